@@ -4,6 +4,7 @@ Metrics Extractor - A tool for extracting metrics from various data sources.
 
 __version__ = "0.1.0"
 
+from metrics_extractor.core.cache import LRUQueryCache, QueryCache
 from metrics_extractor.core.extractor import MetricsExtractor
 from metrics_extractor.core.logging import logger, setup_logging
 from metrics_extractor.datasources.influxdb import InfluxDBSource
@@ -12,6 +13,8 @@ from metrics_extractor.formatters import register_formatter
 
 __all__ = [
     "MetricsExtractor",
+    "QueryCache",
+    "LRUQueryCache",
     "PrometheusSource",
     "InfluxDBSource",
     "register_formatter",
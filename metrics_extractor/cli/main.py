@@ -2,7 +2,7 @@
 Command-line interface for the Metrics Extractor.
 """
 
-import logging
+import concurrent.futures
 import os
 import traceback
 from datetime import datetime
@@ -10,17 +10,92 @@ from typing import Optional, Dict, Any, Union
 
 import click
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
 import requests
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import (
+    BarColumn,
+    MofNCompleteColumn,
+    Progress,
+    SpinnerColumn,
+    TextColumn,
+    TimeRemainingColumn,
+)
 
 from metrics_extractor import InfluxDBSource, MetricsExtractor, PrometheusSource
 from metrics_extractor.core.datasource import DataSource
-from metrics_extractor.core.logging import logger
+from metrics_extractor.core.formatter import get_formatter
+from metrics_extractor.core.logging import setup_logging
 
 # Create console for rich output
 console = Console()
 
+# Formats whose formatters can write straight to the output file
+STREAMED_FORMATS = ("json", "jsonl", "parquet", "hdf5", "feather", "arrow_ipc")
+
+# Output format used for each file extension when saving with --format pandas
+EXTENSION_FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".h5": "hdf5",
+    ".hdf5": "hdf5",
+    ".json": "json",
+    ".jsonl": "jsonl",
+    ".feather": "feather",
+    ".arrow": "arrow_ipc",
+}
+
+
+def _save(path: str, data: Any, output_format: str) -> None:
+    """
+    Save extracted data to a file.
+
+    Args:
+        path: Path of the file to write
+        data: The data, either a DataFrame or already formatted data
+        output_format: Output format requested on the command line
+    """
+    if output_format == "pandas":
+        # For pandas format, pick the file format from the extension, defaulting to CSV
+        extension = os.path.splitext(path)[1].lower()
+        output_format = EXTENSION_FORMATS.get(extension, "csv")
+
+    if isinstance(data, pd.DataFrame):
+        get_formatter(output_format)(data, sink=path)
+    else:
+        # For other formats, save the already formatted data
+        with open(path, "wb" if isinstance(data, bytes) else "w") as f:
+            f.write(data)
+
+
+def _write_partitioned_dataset(output_dir: str, data: Dict[str, pd.DataFrame]) -> None:
+    """
+    Write several metrics as a single Hive-partitioned Parquet dataset.
+
+    Args:
+        output_dir: Base directory of the dataset
+        data: Dictionary mapping metric names to their data. The metric name is
+            stored in the "metric" partition column.
+    """
+    tables = [
+        pa.Table.from_pandas(metric_data.assign(metric=metric_name))
+        for metric_name, metric_data in data.items()
+        if not metric_data.empty
+    ]
+    if not tables:
+        return
+
+    # Metrics may carry different label columns, let Arrow unify the schemas
+    table = pa.concat_tables(tables, promote_options="permissive")
+    ds.write_dataset(
+        table,
+        base_dir=output_dir,
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema([("metric", pa.string())]), flavor="hive"),
+        existing_data_behavior="overwrite_or_ignore",
+    )
+
 
 @click.group()
 @click.version_option()
@@ -58,9 +133,13 @@ def cli():
 @click.option(
     "--format",
     "output_format",
-    type=click.Choice(["pandas", "csv", "json", "parquet", "hdf5", "feather"]),
-    default="csv",
-    help="Output format for the extracted data",
+    type=click.Choice(
+        ["pandas", "csv", "json", "jsonl", "parquet", "hdf5", "feather", "arrow_ipc"]
+    ),
+    default="parquet",
+    help="Output format for the extracted data. Binary columnar formats (parquet, feather) "
+    "are much faster to write and smaller than csv. For large extractions prefer jsonl "
+    "(one record per line, e.g. 'metrics.jsonl') over json",
 )
 @click.option(
     "--output-file",
@@ -101,6 +180,18 @@ def cli():
     is_flag=True,
     help="Combine all metrics into a single output file (legacy behavior)",
 )
+@click.option(
+    "--partitioned",
+    is_flag=True,
+    help="Write all metrics as a single Hive-partitioned Parquet dataset in the directory "
+    "given by --output-file, with one 'metric=<name>' partition per metric",
+)
+@click.option(
+    "--downcast",
+    is_flag=True,
+    help="Store float values as float32 and repeated labels as categories, "
+    "halving output size at the cost of float precision",
+)
 def extract(
     source: str,
     url: str,
@@ -117,6 +208,8 @@ def extract(
     max_workers: int,
     verbose: bool,
     combined_output: bool,
+    partitioned: bool,
+    downcast: bool,
 ):
     """
     Extract metrics from the specified data source.
@@ -137,15 +230,20 @@ def extract(
         --from "2023-01-01T00:00:00Z" --to "2023-01-02T00:00:00Z" \\
         --format parquet --output-file ./metrics.parquet --combined-output
 
+    \b
+    # Extract metrics from Prometheus to a partitioned Parquet dataset
+    metrics-extractor extract --source prometheus --url http://prometheus:9090 \\
+        --metrics "http_requests_total,node_cpu_seconds_total" \\
+        --format parquet --output-file ./metrics_dataset --partitioned
+
     \b
     # Extract all metrics from InfluxDB
     metrics-extractor extract --source influxdb --url http://influxdb:8086 \\
         --token my-token --org my-org --bucket prometheus \\
         --all-metrics --format hdf5 --output-file ./all_metrics.h5
     """
-    # Set logging level
-    if verbose:
-        logger.setLevel(logging.DEBUG)
+    # Configure logging, queued when worker threads log concurrently
+    setup_logging(level="DEBUG" if verbose else "INFO", use_queue=parallel)
 
     # Parse metrics
     metrics_list = None
@@ -157,6 +255,13 @@ def extract(
         )
         return
 
+    if partitioned and (output_format != "parquet" or combined_output):
+        console.print(
+            "[bold red]Error:[/bold red] --partitioned requires --format parquet "
+            "and cannot be combined with --combined-output"
+        )
+        return
+
     # Parse time range
     from_datetime = None
     to_datetime = None
@@ -209,72 +314,83 @@ def extract(
     # Create extractor
     extractor = MetricsExtractor()
 
+    # These formats are written straight to disk from the DataFrame, so extract pandas
+    # data and skip building an in-memory copy of the file
+    extract_format = "pandas" if output_format in STREAMED_FORMATS else output_format
+
     try:
         # Extract data
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            TimeRemainingColumn(),
             console=console,
         ) as progress:
-            task_id = progress.add_task(
-                description="Extracting metrics...",
-                total=None,
-            )
-
-            if parallel and metrics_list and len(metrics_list) > 1:
+            if parallel and metrics_list and len(metrics_list) > 1 and not combined_output:
                 console.print(f"Extracting {len(metrics_list)} metrics in parallel...")
+                task_id = progress.add_task("Extracting metrics...", total=len(metrics_list))
+                data = {}
+                for metric_name, metric_data in extractor.extract_parallel_iter(
+                    source=data_source,
+                    metrics=metrics_list,
+                    from_time=from_datetime,
+                    to_time=to_datetime,
+                    output_format=extract_format,
+                    max_workers=max_workers,
+                    downcast=downcast,
+                ):
+                    data[metric_name] = metric_data
+                    progress.advance(task_id)
+            elif parallel and metrics_list and len(metrics_list) > 1:
+                console.print(f"Extracting {len(metrics_list)} metrics in parallel...")
+                task_id = progress.add_task("Extracting metrics...", total=1)
                 data = extractor.extract_parallel(
                     source=data_source,
                     metrics=metrics_list,
                     from_time=from_datetime,
                     to_time=to_datetime,
-                    output_format=output_format,
+                    output_format=extract_format,
                     max_workers=max_workers,
-                    separate_metrics=not combined_output,
+                    separate_metrics=False,
+                    downcast=downcast,
                 )
+                progress.advance(task_id)
             else:
                 console.print("Extracting metrics...")
+                # All metrics are fetched by a single batched call
+                task_id = progress.add_task("Extracting metrics...", total=1)
                 data = extractor.extract(
                     source=data_source,
                     metrics=metrics_list,
                     from_time=from_datetime,
                     to_time=to_datetime,
-                    output_format=output_format,
+                    output_format=extract_format,
                     separate_metrics=not combined_output,
+                    downcast=downcast,
                 )
-
-            progress.update(task_id, completed=True)
+                progress.advance(task_id)
 
         # If we have combined output, save to a single file
         if combined_output or not isinstance(data, dict):
             # Combined output or single metric
             console.print(f"Saving data to {output_file}...")
-            
-            if output_format == "pandas" and isinstance(data, pd.DataFrame):
-                # For pandas format, we need to save the DataFrame
-                if output_file.endswith(".csv"):
-                    data.to_csv(output_file)
-                elif output_file.endswith(".parquet"):
-                    data.to_parquet(output_file)
-                elif output_file.endswith(".h5") or output_file.endswith(".hdf5"):
-                    data.to_hdf(output_file, key="metrics")
-                elif output_file.endswith(".json"):
-                    data.to_json(output_file, orient="records")
-                elif output_file.endswith(".feather"):
-                    data.to_feather(output_file)
-                else:
-                    # Default to CSV
-                    data.to_csv(output_file)
-            else:
-                # For other formats, save the already formatted data
-                with open(output_file, "wb" if isinstance(data, bytes) else "w") as f:
-                    f.write(data)
+
+            _save(output_file, data, output_format)
 
             console.print(f"[bold green]Success![/bold green] Data saved to {output_file}")
 
             # Print summary for pandas data
             if isinstance(data, pd.DataFrame):
                 console.print(f"[bold]Summary:[/bold] {len(data)} rows, {len(data.columns)} columns")
+        elif partitioned:
+            # Write all metrics as one partitioned dataset
+            console.print(f"Saving metrics to partitioned dataset {output_file}...")
+            _write_partitioned_dataset(output_file, data)
+            console.print(
+                f"[bold green]Success![/bold green] {len(data)} metrics saved to {output_file}"
+            )
         else:
             # We have multiple metrics to save to separate files
             assert isinstance(data, dict), "Expected a dictionary of metrics when not using combined output"
@@ -286,38 +402,34 @@ def extract(
             # Track total files saved for summary
             files_saved = 0
             
-            # Process each metric
-            for metric_name, metric_data in data.items():
-                # Generate unique filename for each metric
-                metric_file = f"{base_name}_{metric_name}{extension}"
-                console.print(f"Saving metric '{metric_name}' to {metric_file}...")
-                
-                if output_format == "pandas" and isinstance(metric_data, pd.DataFrame):
-                    # For pandas format, we need to save the DataFrame
-                    if metric_file.endswith(".csv"):
-                        metric_data.to_csv(metric_file)
-                    elif metric_file.endswith(".parquet"):
-                        metric_data.to_parquet(metric_file)
-                    elif metric_file.endswith(".h5") or metric_file.endswith(".hdf5"):
-                        metric_data.to_hdf(metric_file, key="metrics")
-                    elif metric_file.endswith(".json"):
-                        metric_data.to_json(metric_file, orient="records")
-                    elif metric_file.endswith(".feather"):
-                        metric_data.to_feather(metric_file)
-                    else:
-                        # Default to CSV
-                        metric_data.to_csv(metric_file)
-                else:
-                    # For other formats, save the already formatted data
-                    with open(metric_file, "wb" if isinstance(metric_data, bytes) else "w") as f:
-                        f.write(metric_data)
-                
-                files_saved += 1
-                
-                # Print individual metric summary for pandas data
-                if isinstance(metric_data, pd.DataFrame):
-                    console.print(f"   [bold]Metric summary:[/bold] {len(metric_data)} rows, {len(metric_data.columns)} columns")
-            
+            # Generate unique filename for each metric
+            metric_files = {
+                metric_name: f"{base_name}_{metric_name}{extension}" for metric_name in data
+            }
+
+            # Writes to independent files release the GIL in the pandas/Arrow C code, so
+            # they run concurrently. PyTables is not thread-safe, so HDF5 stays sequential.
+            writes_hdf5 = output_format == "hdf5" or extension in (".h5", ".hdf5")
+            save_workers = 1 if writes_hdf5 else min(len(data), os.cpu_count() or 1)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max(save_workers, 1)) as executor:
+                futures = {
+                    executor.submit(
+                        _save, metric_files[metric_name], metric_data, output_format
+                    ): metric_name
+                    for metric_name, metric_data in data.items()
+                }
+
+                for future in concurrent.futures.as_completed(futures):
+                    metric_name = futures[future]
+                    future.result()
+                    console.print(f"Saved metric '{metric_name}' to {metric_files[metric_name]}")
+                    files_saved += 1
+
+                    # Print individual metric summary for pandas data
+                    metric_data = data[metric_name]
+                    if isinstance(metric_data, pd.DataFrame):
+                        console.print(f"   [bold]Metric summary:[/bold] {len(metric_data)} rows, {len(metric_data.columns)} columns")
+
             console.print(f"[bold green]Success![/bold green] {files_saved} metric files saved")
 
     except (ConnectionError, ValueError, IOError, requests.RequestException) as e:
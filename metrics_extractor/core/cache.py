@@ -0,0 +1,118 @@
+"""
+Caches of query results for incremental extraction.
+"""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Hashable, Optional, Tuple
+
+import pandas as pd
+
+# A cached result: the end of the time window it covers and the data
+CacheEntry = Tuple[datetime, pd.DataFrame]
+
+
+def floor_to_minute(dt: datetime) -> datetime:
+    """
+    Round a datetime down to the start of its minute.
+
+    Rounding query bounds keeps the cache keys (and the query text sent to the
+    server) identical for calls made within the same minute.
+
+    Args:
+        dt: The datetime to round
+
+    Returns:
+        datetime: The rounded datetime
+    """
+    return dt.replace(second=0, microsecond=0)
+
+
+def floor_time(dt: datetime, granularity: timedelta) -> datetime:
+    """
+    Round a datetime down to a multiple of a granularity since the epoch.
+
+    Args:
+        dt: The datetime to round
+        granularity: The rounding step
+
+    Returns:
+        datetime: The rounded datetime
+    """
+    return dt - timedelta(seconds=dt.timestamp() % granularity.total_seconds())
+
+
+def ceil_time(dt: datetime, granularity: timedelta) -> datetime:
+    """
+    Round a datetime up to a multiple of a granularity since the epoch.
+
+    Args:
+        dt: The datetime to round
+        granularity: The rounding step
+
+    Returns:
+        datetime: The rounded datetime
+    """
+    floored = floor_time(dt, granularity)
+    return floored if floored == dt else floored + granularity
+
+
+class QueryCache(ABC):
+    """
+    Abstract base class for query result caches.
+
+    Keys identify a (source, metric, start time) triple; values hold the data
+    fetched from that start time up to the end of the cached window.
+    """
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        """
+        Get a cached result.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            Optional[CacheEntry]: The end of the cached window and its data, or None
+            if the key is not cached.
+        """
+
+    @abstractmethod
+    def put(self, key: Hashable, entry: CacheEntry) -> None:
+        """
+        Store a result, replacing any previous entry for the key.
+
+        Args:
+            key: The cache key
+            entry: The end of the cached window and its data
+        """
+
+
+class LRUQueryCache(QueryCache):
+    """
+    In-memory query cache evicting the least recently used entries.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: Hashable, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
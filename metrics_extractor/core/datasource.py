@@ -4,9 +4,10 @@ Abstract base class for data sources.
 
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 
 import pandas as pd
+import requests
 
 
 class DataSource(ABC):
@@ -18,13 +19,17 @@ class DataSource(ABC):
     """
 
     @abstractmethod
-    def connect(self) -> None:
+    def connect(self, session: Optional[requests.Session] = None) -> None:
         """
         Establish connection to the data source.
 
         This method should handle authentication, connection setup, and
         validation.
 
+        Args:
+            session: Optional pooled HTTP session to reuse for all requests made
+                by the data source.
+
         Raises:
             ConnectionError: If connection to the data source fails.
         """
@@ -63,3 +68,90 @@ class DataSource(ABC):
             ConnectionError: If connection to the data source fails.
             ValueError: If the specified metrics or time range is invalid.
         """
+
+    def iter_data(
+        self,
+        metrics: Optional[List[str]],
+        from_time: Optional[datetime],
+        to_time: Optional[datetime],
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Get data for specified metrics and time range as a sequence of chunks.
+
+        Lets callers process or write data incrementally with bounded memory.
+        Data sources able to stream results should override this method; the
+        default implementation yields the result of get_data as a single chunk.
+
+        Args:
+            metrics: List of metrics to extract. If None, extract all available metrics.
+            from_time: Start time for the extraction. If None, use the earliest available time.
+            to_time: End time for the extraction. If None, use the latest available time.
+
+        Yields:
+            pd.DataFrame: Chunks of the extracted metrics data.
+
+        Raises:
+            ConnectionError: If connection to the data source fails.
+            ValueError: If the specified metrics or time range is invalid.
+        """
+        yield self.get_data(metrics, from_time, to_time)
+
+    def get_data_batch(
+        self,
+        metrics: List[str],
+        from_time: Optional[datetime],
+        to_time: Optional[datetime],
+    ) -> pd.DataFrame:
+        """
+        Get data for several metrics as a single long-form DataFrame.
+
+        The returned DataFrame has a ``__name__`` column holding the requested
+        metric each row belongs to, so callers can split it per metric. Data
+        sources able to fetch several metrics in one request should override
+        this method; the default implementation calls get_data once per metric.
+
+        Args:
+            metrics: List of metrics to extract.
+            from_time: Start time for the extraction. If None, use the earliest available time.
+            to_time: End time for the extraction. If None, use the latest available time.
+
+        Returns:
+            pd.DataFrame: A DataFrame containing the data of all requested metrics.
+
+        Raises:
+            ConnectionError: If connection to the data source fails.
+            ValueError: If the specified metrics or time range is invalid.
+        """
+        frames = [
+            self.get_data([metric], from_time, to_time).assign(__name__=metric)
+            for metric in metrics
+        ]
+        if frames:
+            return pd.concat(frames)
+        return pd.DataFrame(columns=["metric", "value", "__name__"])
+
+    def get_time_bounds(
+        self,
+        metrics: List[str],
+    ) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """
+        Get the times of the earliest and latest samples of the specified metrics.
+
+        Data sources should override this method with a metadata query. The default
+        implementation derives the bounds from the data returned by get_data for
+        the default time range.
+
+        Args:
+            metrics: List of metrics to inspect.
+
+        Returns:
+            Tuple[Optional[datetime], Optional[datetime]]: The earliest and latest sample
+            times, or (None, None) if there is no data.
+
+        Raises:
+            ConnectionError: If connection to the data source fails.
+        """
+        data = self.get_data(metrics, None, None)
+        if data.empty:
+            return None, None
+        return data.index.min(), data.index.max()
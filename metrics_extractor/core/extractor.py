@@ -2,21 +2,85 @@
 Core module for extracting metrics data.
 """
 
+import asyncio
 import concurrent.futures
-from datetime import datetime, timedelta
-from typing import Any, Dict, Iterator, List, Optional, Union
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+try:
+    import aiohttp
+except ImportError:  # aiohttp is optional, parallel extraction falls back to threads
+    aiohttp = None
+
+from metrics_extractor.core.cache import QueryCache, floor_to_minute
 from metrics_extractor.core.datasource import DataSource
 from metrics_extractor.core.formatter import get_formatter
 
 
+def _downcast(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Downcast a metrics DataFrame to smaller dtypes.
+
+    float64 columns become float32 and string columns whose number of distinct
+    values is below half the number of rows become category.
+
+    Args:
+        data: The DataFrame to downcast
+
+    Returns:
+        pd.DataFrame: The downcast DataFrame
+    """
+    conversions: Dict[str, str] = {
+        col: "float32" for col in data.select_dtypes("float64").columns
+    }
+    # pandas 3 stores strings with the string dtype rather than object
+    for col in data.select_dtypes(["object", "string"]).columns:
+        if data[col].nunique() < 0.5 * len(data):
+            conversions[col] = "category"
+    return data.astype(conversions) if conversions else data
+
+
 class MetricsExtractor:
     """
     Main interface for extracting metrics from various data sources.
     """
 
+    def __init__(self, pool_size: int = 32, cache: Optional[QueryCache] = None):
+        """
+        Initialize the extractor.
+
+        Args:
+            pool_size: Number of pooled HTTP connections shared by all metric fetches
+            cache: Optional query cache. When set, repeated calls to extract with the
+                same start time only query the part of the window not cached yet.
+                Time bounds are then rounded down to the minute.
+        """
+        self._cache = cache
+        self._pool_size = 0
+        self._session = requests.Session()
+        self._mount_adapters(pool_size)
+
+    def _mount_adapters(self, pool_size: int) -> None:
+        """
+        Mount pooled HTTP adapters with retries on the shared session.
+
+        Args:
+            pool_size: Maximum number of connections kept alive per host
+        """
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=3, backoff_factor=0.3),
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._pool_size = pool_size
+
     def extract(
         self,
         source: DataSource,
@@ -25,6 +89,7 @@ class MetricsExtractor:
         to_time: Optional[datetime] = None,
         output_format: str = "pandas",
         separate_metrics: bool = True,
+        downcast: bool = False,
     ) -> Union[Any, Dict[str, Any]]:
         """
         Extract metrics from the specified source.
@@ -37,6 +102,9 @@ class MetricsExtractor:
             output_format: Format to return the data in ("pandas", "numpy", "dict", etc.)
             separate_metrics: If True, return a dictionary with a separate entry for each metric.
                              If False, return a combined dataset (legacy behavior).
+            downcast: If True, store float64 columns as float32 and low-cardinality string
+                      columns as category before formatting. This halves the memory and
+                      output size at the cost of float precision.
 
         Returns:
             Union[Any, Dict[str, Any]]: Either a single formatted dataset (if separate_metrics=False)
@@ -46,28 +114,151 @@ class MetricsExtractor:
             ConnectionError: If connection to the data source fails
             ValueError: If the specified metrics, time range, or output format is invalid
         """
+        # Resolve the formatter once, it does not change between metrics
+        formatter = get_formatter(output_format)
+
         # Ensure connection to the data source
-        source.connect()
+        source.connect(session=self._session)
 
         # If separate_metrics is False, use the original behavior
         if not separate_metrics:
             data = source.get_data(metrics, from_time, to_time)
-            formatter = get_formatter(output_format)
+            if downcast:
+                data = _downcast(data)
             return formatter(data)
 
         # Get available metrics if not specified
         if metrics is None:
             metrics = source.get_metrics()
 
-        # Process each metric separately
+        if self._cache is not None and from_time is not None:
+            groups = self._fetch_cached(source, metrics, from_time, to_time)
+        else:
+            groups = self._fetch_batch(source, metrics, from_time, to_time)
+
         results = {}
         for metric in metrics:
-            data = source.get_data([metric], from_time, to_time)
-            formatter = get_formatter(output_format)
+            data = groups.get(metric)
+            if data is None:
+                data = pd.DataFrame(columns=["metric", "value"])
+            if downcast:
+                data = _downcast(data)
             results[metric] = formatter(data)
 
         return results
 
+    @staticmethod
+    def _fetch_batch(
+        source: DataSource,
+        metrics: List[str],
+        from_time: Optional[datetime],
+        to_time: Optional[datetime],
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch metrics in as few requests as the source allows, then split by metric.
+
+        Args:
+            source: The data source to extract metrics from
+            metrics: List of metrics to extract
+            from_time: Start time for the extraction
+            to_time: End time for the extraction
+
+        Returns:
+            Dict[str, pd.DataFrame]: The data of each metric that returned samples
+        """
+        batch_data = source.get_data_batch(metrics, from_time, to_time)
+        return {
+            metric: MetricsExtractor._batch_group_data(data)
+            for metric, data in batch_data.groupby("__name__", sort=False, observed=True)
+        }
+
+    @staticmethod
+    def _batch_group_data(data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Turn the rows of one metric of a batch into the frame get_data would return.
+
+        The batch holds the label columns of all its metrics, so the labels of other
+        metrics are dropped, and categoricals keep only the values of this metric.
+
+        Args:
+            data: The rows of one metric, with the ``__name__`` column
+
+        Returns:
+            pd.DataFrame: The data of the metric
+        """
+        data = data.drop(columns="__name__")
+        other_labels = [
+            column
+            for column in data.columns
+            if column not in ("metric", "value") and data[column].isna().all()
+        ]
+        data = data.drop(columns=other_labels)
+        categories = {
+            column: data[column].cat.remove_unused_categories()
+            for column in data.columns
+            if data[column].dtype == "category"
+        }
+        return data.assign(**categories) if categories else data
+
+    def _fetch_cached(
+        self,
+        source: DataSource,
+        metrics: List[str],
+        from_time: datetime,
+        to_time: Optional[datetime],
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch metrics through the query cache.
+
+        Entries are keyed by source, metric and start time. A cached window is
+        extended by querying only from its end to the requested end, so repeated
+        calls cost O(new data) instead of O(whole window). Metrics whose cached
+        windows end at the same time are fetched together.
+
+        Args:
+            source: The data source to extract metrics from
+            metrics: List of metrics to extract
+            from_time: Start time for the extraction, rounded down to the minute
+            to_time: End time for the extraction, rounded down to the minute.
+                If None, the current time is used.
+
+        Returns:
+            Dict[str, pd.DataFrame]: The data of each metric. The DataFrames are shared
+            with the cache and must not be modified in place.
+        """
+        start = floor_to_minute(from_time)
+        end = floor_to_minute(to_time if to_time is not None else datetime.now())
+
+        results: Dict[str, pd.DataFrame] = {}
+        cached: Dict[str, pd.DataFrame] = {}
+        # Metrics still to fetch, grouped by the time their fetch starts from
+        pending: Dict[datetime, List[str]] = {}
+        for metric in metrics:
+            entry = self._cache.get((source, metric, start))
+            if entry is not None and entry[0] == end:
+                results[metric] = entry[1]
+            elif entry is not None and entry[0] < end:
+                cached[metric] = entry[1]
+                pending.setdefault(entry[0], []).append(metric)
+            else:
+                pending.setdefault(start, []).append(metric)
+
+        for fetch_from, group in pending.items():
+            fetched = self._fetch_batch(source, group, fetch_from, end)
+            for metric in group:
+                data = fetched.get(metric, pd.DataFrame(columns=["metric", "value"]))
+                prefix = cached.get(metric)
+                if prefix is not None and not prefix.empty:
+                    if data.empty:
+                        data = prefix
+                    else:
+                        # Both windows include the boundary, keep only samples after the prefix
+                        data = pd.concat([prefix, data[data.index > prefix.index.max()]])
+                self._cache.put((source, metric, start), (end, data))
+                results[metric] = data
+
+        return results
+
     def extract_parallel(
         self,
         source: DataSource,
@@ -77,12 +268,16 @@ class MetricsExtractor:
         output_format: str = "pandas",
         max_workers: int = 4,
         separate_metrics: bool = True,
+        downcast: bool = False,
     ) -> Union[Any, Dict[str, Any]]:
         """
         Extract multiple metrics in parallel.
 
         This method extracts each metric separately in parallel and can return either
         a combined result or a dictionary with separate results for each metric.
+        Sources implementing ``get_data_async`` are queried concurrently on a single
+        event loop sharing one aiohttp connection pool; other sources fall back to a
+        thread pool.
 
         Args:
             source: The data source to extract metrics from
@@ -90,9 +285,12 @@ class MetricsExtractor:
             from_time: Start time for the extraction
             to_time: End time for the extraction
             output_format: Format to return the data in
-            max_workers: Maximum number of parallel workers
+            max_workers: Maximum number of parallel workers (or concurrent connections)
             separate_metrics: If True, return a dictionary with a separate entry for each metric.
                              If False, return a combined dataset (legacy behavior).
+            downcast: If True, store float64 columns as float32 and low-cardinality string
+                      columns as category before formatting. This halves the memory and
+                      output size at the cost of float precision.
 
         Returns:
             Union[Any, Dict[str, Any]]: Either a single formatted dataset (if separate_metrics=False)
@@ -102,63 +300,229 @@ class MetricsExtractor:
             ConnectionError: If connection to the data source fails
             ValueError: If the specified metrics, time range, or output format is invalid
         """
+        if separate_metrics:
+            return dict(
+                self.extract_parallel_iter(
+                    source=source,
+                    metrics=metrics,
+                    from_time=from_time,
+                    to_time=to_time,
+                    output_format=output_format,
+                    max_workers=max_workers,
+                    downcast=downcast,
+                )
+            )
+
+        # Combined output, concatenate the raw per-metric frames before formatting
+        formatter = get_formatter(output_format)
+        results = [
+            data
+            for _, data in self._iter_parallel_results(
+                source, metrics, from_time, to_time, max_workers
+            )
+        ]
+        combined_data = pd.concat(results)
+        if downcast:
+            # After concatenation, categories of different metrics would be merged back to object
+            combined_data = _downcast(combined_data)
+        return formatter(combined_data)
+
+    def extract_parallel_iter(
+        self,
+        source: DataSource,
+        metrics: List[str],
+        from_time: Optional[datetime] = None,
+        to_time: Optional[datetime] = None,
+        output_format: str = "pandas",
+        max_workers: int = 4,
+        downcast: bool = False,
+    ) -> Iterator[Tuple[str, Any]]:
+        """
+        Extract multiple metrics in parallel, yielding each metric as soon as it completes.
+
+        This generator allows callers to report progress per metric. Metrics are
+        yielded in completion order, not in the order they were requested.
+
+        Args:
+            source: The data source to extract metrics from
+            metrics: List of metrics to extract (must be provided for parallel extraction)
+            from_time: Start time for the extraction
+            to_time: End time for the extraction
+            output_format: Format to return the data in
+            max_workers: Maximum number of parallel workers (or concurrent connections)
+            downcast: If True, store float64 columns as float32 and low-cardinality string
+                      columns as category before formatting.
+
+        Yields:
+            Tuple[str, Any]: The metric name and its formatted data
+
+        Raises:
+            ConnectionError: If connection to the data source fails
+            ValueError: If the specified metrics, time range, or output format is invalid
+        """
+        # Resolve the formatter once, it does not change between metrics
+        formatter = get_formatter(output_format)
+
+        for metric, data in self._iter_parallel_results(
+            source, metrics, from_time, to_time, max_workers
+        ):
+            if downcast:
+                data = _downcast(data)
+            yield metric, formatter(data)
+
+    def _iter_parallel_results(
+        self,
+        source: DataSource,
+        metrics: List[str],
+        from_time: Optional[datetime],
+        to_time: Optional[datetime],
+        max_workers: int,
+    ) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """
+        Fetch multiple metrics in parallel, yielding raw DataFrames in completion order.
+
+        Args:
+            source: The data source to extract metrics from
+            metrics: List of metrics to extract
+            from_time: Start time for the extraction
+            to_time: End time for the extraction
+            max_workers: Maximum number of parallel workers (or concurrent connections)
+
+        Yields:
+            Tuple[str, pd.DataFrame]: The metric name and its data
+        """
         if not metrics:
             raise ValueError("Metrics list must be provided for parallel extraction")
 
+        # Make sure worker threads don't block waiting for a pooled connection
+        if max_workers > self._pool_size:
+            self._mount_adapters(max_workers)
+
         # Ensure connection to the data source
-        source.connect()
+        source.connect(session=self._session)
+
+        if self._supports_async(source):
+            # Share one event loop and one keep-alive connection pool for all metrics
+            yield from self._iter_async_results(source, metrics, from_time, to_time, max_workers)
+            return
 
-        # Extract each metric in parallel
+        # Extract each metric in parallel. The source is already connected, so the
+        # workers call get_data directly instead of going through extract (which
+        # would connect again for every metric).
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
             futures = {
-                executor.submit(
-                    self.extract,
-                    source=source,
-                    metrics=[metric],
-                    from_time=from_time,
-                    to_time=to_time,
-                    output_format="pandas",  # Always use pandas for intermediate results
-                    separate_metrics=False,  # Get individual metric results without nesting
-                ): metric
+                executor.submit(source.get_data, [metric], from_time, to_time): metric
                 for metric in metrics
             }
 
             # Collect results
-            results = {}
             for future in concurrent.futures.as_completed(futures):
-                metric = futures[future]
-                results[metric] = future.result()
+                yield futures[future], future.result()
 
-        # If separate_metrics is False, combine the results
-        if not separate_metrics:
-            if results:
-                # Convert all results to pandas dataframes for concatenation
-                pandas_results = []
-                for result in results.values():
-                    # Convert back to pandas if needed
-                    if not isinstance(result, pd.DataFrame):
-                        # This is a fallback and might not work for all formats
-                        # Better to use pandas directly for intermediate results
-                        result = pd.DataFrame(result)
-                    pandas_results.append(result)
-                
-                combined_data = pd.concat(pandas_results) if pandas_results else pd.DataFrame()
-                formatter = get_formatter(output_format)
-                return formatter(combined_data)
-            return get_formatter(output_format)(pd.DataFrame())
-        
-        # Format each result according to the requested output format
-        formatted_results = {}
-        for metric, result in results.items():
-            formatter = get_formatter(output_format)
-            # If the result is already a pandas DataFrame, format it
-            if isinstance(result, pd.DataFrame):
-                formatted_results[metric] = formatter(result)
-            else:
-                # If it's already in the requested format, keep it as is
-                formatted_results[metric] = result
-                
-        return formatted_results
+    @staticmethod
+    def _supports_async(source: DataSource) -> bool:
+        """
+        Check whether the asynchronous extraction path can be used for a source.
+
+        Args:
+            source: The data source to extract metrics from
+
+        Returns:
+            bool: True if aiohttp is available, the source implements get_data_async
+            and no event loop is already running in this thread
+        """
+        if aiohttp is None or not callable(getattr(source, "get_data_async", None)):
+            return False
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return True
+        # A private event loop cannot be driven inside a running loop (e.g. notebooks)
+        return False
+
+    async def _extract_one_async(
+        self,
+        session: "aiohttp.ClientSession",
+        source: DataSource,
+        metric: str,
+        from_time: Optional[datetime],
+        to_time: Optional[datetime],
+    ) -> Tuple[str, pd.DataFrame]:
+        """
+        Extract a single metric through the asynchronous source API.
+
+        Args:
+            session: The aiohttp session shared by all metric queries
+            source: The data source to extract metrics from
+            metric: The metric to extract
+            from_time: Start time for the extraction
+            to_time: End time for the extraction
+
+        Returns:
+            Tuple[str, pd.DataFrame]: The metric name and its data
+        """
+        data = await source.get_data_async(session, [metric], from_time, to_time)
+        return metric, data
+
+    def _iter_async_results(
+        self,
+        source: DataSource,
+        metrics: List[str],
+        from_time: Optional[datetime],
+        to_time: Optional[datetime],
+        max_workers: int,
+    ) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """
+        Extract multiple metrics concurrently on a private event loop.
+
+        The loop only runs while waiting for the next completed metric, so results
+        are yielded as soon as they are available.
+
+        Args:
+            source: The data source to extract metrics from
+            metrics: List of metrics to extract
+            from_time: Start time for the extraction
+            to_time: End time for the extraction
+            max_workers: Maximum number of concurrent connections
+
+        Yields:
+            Tuple[str, pd.DataFrame]: The metric name and its data
+        """
+
+        async def open_session() -> "aiohttp.ClientSession":
+            connector = aiohttp.TCPConnector(limit=max_workers, limit_per_host=max_workers)
+            return aiohttp.ClientSession(connector=connector)
+
+        loop = asyncio.new_event_loop()
+        try:
+            session = loop.run_until_complete(open_session())
+            pending = {
+                loop.create_task(
+                    self._extract_one_async(session, source, metric, from_time, to_time)
+                )
+                for metric in metrics
+            }
+            try:
+                while pending:
+                    done, pending = loop.run_until_complete(
+                        asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    )
+                    for task in done:
+                        yield task.result()
+            finally:
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+                # Sources may keep per-run async clients, bound to this loop
+                close_async = getattr(source, "close_async", None)
+                try:
+                    if callable(close_async):
+                        loop.run_until_complete(close_async())
+                finally:
+                    loop.run_until_complete(session.close())
+        finally:
+            loop.close()
 
     def extract_incremental(
         self,
@@ -169,12 +533,15 @@ class MetricsExtractor:
         chunk_size: timedelta = timedelta(days=1),
         output_format: str = "pandas",
         separate_metrics: bool = True,
+        prefetch_chunks: int = 4,
     ) -> Iterator[Union[Any, Dict[str, Any]]]:
         """
         Extract data incrementally in chunks.
 
         This method is a generator that yields chunks of data for the specified
-        time range, divided into intervals of the specified chunk size.
+        time range, divided into intervals of the specified chunk size. Upcoming
+        chunks are fetched in background threads while the current one is being
+        consumed; chunks are always yielded in time order.
 
         Args:
             source: The data source to extract metrics from
@@ -185,6 +552,8 @@ class MetricsExtractor:
             output_format: Format to return the data in
             separate_metrics: If True, yield dictionaries with separate entries for each metric.
                              If False, yield combined datasets (legacy behavior).
+            prefetch_chunks: Maximum number of chunks fetched ahead of the consumer.
+                             Use 1 to fetch chunks strictly one at a time.
 
         Yields:
             Union[Any, Dict[str, Any]]: Chunks of data in the specified format
@@ -193,8 +562,11 @@ class MetricsExtractor:
             ConnectionError: If connection to the data source fails
             ValueError: If the specified metrics, time range, or output format is invalid
         """
+        # Resolve the formatter once, it does not change between chunks or metrics
+        formatter = get_formatter(output_format)
+
         # Ensure connection to the data source
-        source.connect()
+        source.connect(session=self._session)
 
         # Get available metrics if not specified
         if metrics is None:
@@ -202,40 +574,66 @@ class MetricsExtractor:
 
         # Get actual time range if not specified
         if from_time is None or to_time is None:
-            # Get a small sample to determine time range
-            sample_data = source.get_data(metrics, None, None)
-            if sample_data.empty:
-                # No data available
-                return
+            # Ask the source for the time bounds instead of fetching the data
+            earliest, latest = source.get_time_bounds(metrics)
 
             # Use actual time range from data if not specified
             if from_time is None:
-                from_time = sample_data.index.min()
+                if earliest is None:
+                    # No data available
+                    return
+                from_time = earliest
             if to_time is None:
-                to_time = sample_data.index.max()
-        
+                # Without a known latest sample, extract up to now
+                to_time = latest if latest is not None else datetime.now(timezone.utc)
+
         # Ensure we have valid datetime objects for from_time and to_time
         if from_time is None or to_time is None:
             raise ValueError("Could not determine time range for incremental extraction")
 
-        # Extract data in chunks
+        # Sources report their bounds in UTC; a naive bound given by the caller is in
+        # local time, as for get_data, and must be made comparable with them
+        if (from_time.tzinfo is None) != (to_time.tzinfo is None):
+            from_time = from_time.astimezone(timezone.utc)
+            to_time = to_time.astimezone(timezone.utc)
+
+        # Split the time range into chunks
+        windows = []
         current_time = from_time
         while current_time < to_time:
             chunk_end = min(current_time + chunk_size, to_time)
+            windows.append((current_time, chunk_end))
+            current_time = chunk_end
 
+        def fetch_chunk(window: Tuple[datetime, datetime]) -> Union[pd.DataFrame, Dict[str, pd.DataFrame]]:
+            chunk_start, chunk_end = window
             if separate_metrics:
                 # Process each metric separately
-                chunk_results = {}
-                for metric in metrics:
-                    chunk_data = source.get_data([metric], current_time, chunk_end)
-                    formatter = get_formatter(output_format)
-                    chunk_results[metric] = formatter(chunk_data)
-                yield chunk_results
-            else:
-                # Original behavior - combined results
-                chunk_data = source.get_data(metrics, current_time, chunk_end)
-                formatter = get_formatter(output_format)
-                yield formatter(chunk_data)
-
-            # Move to the next chunk
-            current_time = chunk_end
+                return {
+                    metric: source.get_data([metric], chunk_start, chunk_end)
+                    for metric in metrics
+                }
+            # Original behavior - combined results
+            return source.get_data(metrics, chunk_start, chunk_end)
+
+        # Fetch the next chunks in the background while the caller processes the current
+        # one, and yield them in time order
+        prefetch_chunks = max(prefetch_chunks, 1)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=prefetch_chunks) as executor:
+            futures: Dict[int, concurrent.futures.Future] = {}
+            next_index = 0
+            try:
+                for index in range(len(windows)):
+                    while next_index < len(windows) and next_index < index + prefetch_chunks:
+                        futures[next_index] = executor.submit(fetch_chunk, windows[next_index])
+                        next_index += 1
+
+                    chunk_data = futures.pop(index).result()
+                    if separate_metrics:
+                        yield {metric: formatter(data) for metric, data in chunk_data.items()}
+                    else:
+                        yield formatter(chunk_data)
+            finally:
+                # The caller stopped early, don't fetch chunks nobody will consume
+                for future in futures.values():
+                    future.cancel()
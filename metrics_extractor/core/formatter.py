@@ -3,9 +3,26 @@ Output formatter module for metrics data.
 """
 
 import io
-from typing import Any, Callable, Dict
+import os
+import tempfile
+from typing import Any, Callable, Dict, Optional, Union
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Number of rows per Parquet row group, large frames are converted and written one group at a time
+PARQUET_ROW_GROUP_SIZE = 64 * 1024
+
+# pyarrow writer options shared by every Parquet write
+PARQUET_OPTIONS: Dict[str, Any] = {
+    "compression": "zstd",
+    "use_dictionary": True,
+    "data_page_size": 1 << 20,
+}
+
+# Number of rows serialized at a time when streaming JSON lines to a file
+JSON_LINES_CHUNK_ROWS = 65536
 
 # Registry for output formatters
 _formatters: Dict[str, Callable[[pd.DataFrame], Any]] = {}
@@ -46,8 +63,12 @@ def _format_pandas(data: pd.DataFrame) -> pd.DataFrame:
 
 
 def _format_numpy(data: pd.DataFrame) -> Dict[str, Any]:
-    """Convert the data to a dictionary of numpy arrays."""
-    return {col: data[col].values for col in data.columns}
+    """Convert the data to a dictionary of numpy arrays, avoiding copies where possible."""
+    if data.dtypes.nunique() == 1:
+        # A single-dtype frame converts to one 2D array, so every column is a view into it
+        arr = data.to_numpy(copy=False)
+        return {col: arr[:, i] for i, col in enumerate(data.columns)}
+    return {col: data[col].to_numpy(copy=False) for col in data.columns}
 
 
 def _format_dict(data: pd.DataFrame) -> Dict[str, Any]:
@@ -55,46 +76,151 @@ def _format_dict(data: pd.DataFrame) -> Dict[str, Any]:
     return data.to_dict(orient="list")
 
 
-def _format_csv(data: pd.DataFrame) -> str:
-    """Convert the data to a CSV string."""
+def _format_csv(data: pd.DataFrame, sink: Optional[str] = None) -> Optional[str]:
+    """
+    Convert the data to a CSV string.
+
+    If a sink path is given, the data is written straight to it and None is returned.
+    """
+    if sink is not None:
+        data.to_csv(sink)
+        return None
     return data.to_csv()
 
 
-def _format_json(data: pd.DataFrame) -> str:
-    """Convert the data to a JSON string."""
+def _format_json(data: pd.DataFrame, sink: Optional[str] = None) -> Optional[str]:
+    """
+    Convert the data to a JSON string.
+
+    If a sink path is given, the data is written straight to it and None is returned.
+    """
+    if sink is not None:
+        data.to_json(sink, orient="records")
+        return None
     return data.to_json(orient="records")
 
 
-def _format_parquet(data: pd.DataFrame) -> bytes:
-    """Convert the data to Parquet format."""
+def _format_jsonl(data: pd.DataFrame, sink: Optional[str] = None) -> Optional[str]:
+    """
+    Convert the data to newline-delimited JSON, one record per line.
 
-    buffer = io.BytesIO()
-    data.to_parquet(buffer)
-    return buffer.getvalue()
+    If a sink path is given, the data is written to it in slices of rows, so the
+    JSON text of the whole frame is never held in memory, and None is returned.
+    """
+    if sink is None:
+        return data.to_json(orient="records", lines=True)
+
+    with open(sink, "w") as f:
+        for start in range(0, len(data), JSON_LINES_CHUNK_ROWS):
+            chunk = data.iloc[start : start + JSON_LINES_CHUNK_ROWS]
+            text = chunk.to_json(orient="records", lines=True)
+            f.write(text if text.endswith("\n") else text + "\n")
+    return None
 
 
-def _format_hdf5(data: pd.DataFrame) -> bytes:
-    """Convert the data to HDF5 format."""
+def _write_parquet(data: pd.DataFrame, sink: Union[str, io.BytesIO]) -> None:
+    """
+    Write the data to Parquet with pyarrow.
+
+    Large frames are converted to Arrow and written one row group at a time, so an
+    Arrow copy of the whole frame is never held in memory.
+    """
+    if len(data) <= PARQUET_ROW_GROUP_SIZE:
+        data.to_parquet(
+            sink, engine="pyarrow", row_group_size=PARQUET_ROW_GROUP_SIZE, **PARQUET_OPTIONS
+        )
+        return
+
+    # A RangeIndex carries no information, only store real indexes (e.g. timestamps)
+    preserve_index = not isinstance(data.index, pd.RangeIndex)
+    schema = pa.Schema.from_pandas(data, preserve_index=preserve_index)
+    with pq.ParquetWriter(sink, schema, **PARQUET_OPTIONS) as writer:
+        for start in range(0, len(data), PARQUET_ROW_GROUP_SIZE):
+            chunk = data.iloc[start : start + PARQUET_ROW_GROUP_SIZE]
+            writer.write_table(
+                pa.Table.from_pandas(chunk, schema=schema, preserve_index=preserve_index)
+            )
+
+
+def _format_parquet(data: pd.DataFrame, sink: Optional[str] = None) -> Optional[bytes]:
+    """
+    Convert the data to Parquet format.
+
+    If a sink path is given, the data is written straight to it and None is returned.
+    """
+    if sink is not None:
+        _write_parquet(data, sink)
+        return None
 
     buffer = io.BytesIO()
-    data.to_hdf(buffer, key="metrics", mode="w")
+    _write_parquet(data, buffer)
     return buffer.getvalue()
 
 
-def _format_feather(data: pd.DataFrame) -> bytes:
-    """Convert the data to Feather format."""
+def _format_hdf5(data: pd.DataFrame, sink: Optional[str] = None) -> Optional[bytes]:
+    """
+    Convert the data to HDF5 format.
+
+    If a sink path is given, the data is written straight to it and None is returned.
+    PyTables can only write to real files, so without a sink the data goes through a
+    temporary file.
+    """
+    if sink is not None:
+        data.to_hdf(sink, key="metrics", mode="w", complevel=5, complib="blosc:zstd")
+        return None
+
+    with tempfile.NamedTemporaryFile(suffix=".h5", delete=False) as tmp:
+        tmp_path = tmp.name
+    try:
+        data.to_hdf(tmp_path, key="metrics", mode="w", complevel=5, complib="blosc:zstd")
+        with open(tmp_path, "rb") as f:
+            return f.read()
+    finally:
+        os.unlink(tmp_path)
+
+
+def _format_feather(data: pd.DataFrame, sink: Optional[str] = None) -> Optional[bytes]:
+    """
+    Convert the data to Feather format.
+
+    If a sink path is given, the data is written straight to it and None is returned.
+    """
+    if sink is not None:
+        data.to_feather(sink, compression="zstd")
+        return None
 
     buffer = io.BytesIO()
-    data.to_feather(buffer)
+    data.to_feather(buffer, compression="zstd")
     return buffer.getvalue()
 
 
+def _format_arrow_ipc(data: pd.DataFrame, sink: Optional[str] = None) -> Optional[bytes]:
+    """
+    Convert the data to an lz4-compressed Arrow IPC stream.
+
+    This is the cheapest representation for handing data to another process, which
+    can read it with ``pyarrow.ipc.open_stream(data).read_pandas()``. If a sink path is
+    given, the data is written straight to it and None is returned.
+    """
+    table = pa.Table.from_pandas(data)
+    target = sink if sink is not None else pa.BufferOutputStream()
+    options = pa.ipc.IpcWriteOptions(compression="lz4")
+    with pa.ipc.new_stream(target, table.schema, options=options) as writer:
+        writer.write_table(table)
+
+    if sink is not None:
+        return None
+    return target.getvalue().to_pybytes()
+
+
 # Register the built-in formatters
 register_formatter("pandas", _format_pandas)
 register_formatter("numpy", _format_numpy)
 register_formatter("dict", _format_dict)
 register_formatter("csv", _format_csv)
 register_formatter("json", _format_json)
+register_formatter("jsonl", _format_jsonl)
 register_formatter("parquet", _format_parquet)
 register_formatter("hdf5", _format_hdf5)
 register_formatter("feather", _format_feather)
+register_formatter("arrow_ipc", _format_arrow_ipc)
@@ -2,48 +2,89 @@
 Logging configuration for metrics-extractor.
 """
 
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
+# Listener draining the log queue when queued logging is enabled
+_queue_listener: Optional[QueueListener] = None
 
-def setup_logging(level: str = "INFO", log_file: Optional[str] = None) -> logging.Logger:
+
+def _stop_queue_listener() -> None:
+    """Stop the queue listener, flushing any pending records."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+atexit.register(_stop_queue_listener)
+
+
+def setup_logging(
+    level: str = "INFO",
+    log_file: Optional[str] = None,
+    use_queue: bool = False,
+) -> logging.Logger:
     """
     Set up logging configuration for metrics-extractor.
 
+    Calling this function again without a log file only updates the level of the
+    already configured logger.
+
     Args:
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Optional file path to write logs to
+        use_queue: If True, records are put on a queue and written by a background
+            listener, so worker threads don't serialize on the handlers' locks
 
     Returns:
         logging.Logger: Configured logger
     """
+    global _queue_listener
+
     # Create logger
     l = logging.getLogger("metrics_extractor")
 
-    # Clear any existing handlers
-    if l.hasHandlers():
-        l.handlers.clear()
-
     # Set level
     numeric_level = getattr(logging, level.upper(), None)
     if not isinstance(numeric_level, int):
         raise ValueError(f"Invalid log level: {level}")
     l.setLevel(numeric_level)
 
+    # Already configured, nothing else to do
+    if l.handlers and log_file is None and use_queue == (_queue_listener is not None):
+        return l
+
+    # Clear any existing handlers
+    _stop_queue_listener()
+    l.handlers.clear()
+
     # Create formatter
     formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 
     # Create console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    l.addHandler(console_handler)
+    handlers = [console_handler]
 
     # Create file handler if log_file is specified
     if log_file:
         file_handler = logging.FileHandler(log_file)
         file_handler.setFormatter(formatter)
-        l.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    if use_queue:
+        log_queue: queue.Queue = queue.Queue()
+        l.addHandler(QueueHandler(log_queue))
+        _queue_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _queue_listener.start()
+    else:
+        for handler in handlers:
+            l.addHandler(handler)
 
     # Don't propagate to the root logger to avoid duplicate logs
     l.propagate = False
@@ -51,5 +92,6 @@ def setup_logging(level: str = "INFO", log_file: Optional[str] = None) -> loggin
     return l
 
 
-# Create default logger instance
-logger = setup_logging()
+# Package logger. No handlers are installed on import; applications (and the CLI)
+# call setup_logging to configure output.
+logger = logging.getLogger("metrics_extractor")
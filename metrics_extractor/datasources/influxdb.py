@@ -2,15 +2,91 @@
 InfluxDB data source adapter.
 """
 
+import asyncio
+import atexit
+import functools
+import logging
+import string
+import time
 from datetime import datetime, timezone, timedelta
-from typing import List, Optional
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import pandas as pd
-from influxdb_client.client.influxdb_client import InfluxDBClient
-from influxdb_client.client.flux_table import FluxTable
+import requests
 
+from metrics_extractor.core.cache import ceil_time, floor_time
 from metrics_extractor.core.datasource import DataSource
-from metrics_extractor.core.logging import logger
+
+if TYPE_CHECKING:
+    import aiohttp
+    from influxdb_client import InfluxDBClient
+    from influxdb_client.client.influxdb_client_async import InfluxDBClientAsync
+
+logger = logging.getLogger(__name__)
+
+# Supported dtypes of the value column
+VALUE_DTYPES = ("float64", "float32")
+
+
+def _flux_time(dt: datetime) -> str:
+    """
+    Format a UTC datetime as a Flux time literal.
+
+    Formats the fields directly instead of going through the locale-aware
+    ``strftime``.
+
+    Args:
+        dt: The datetime, in UTC
+
+    Returns:
+        str: The RFC 3339 time literal, truncated to whole seconds
+    """
+    return (
+        f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
+        f"T{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}Z"
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _flux_query_template(
+    bucket: str,
+    measurement: Optional[str],
+    metrics: Tuple[str, ...],
+) -> string.Template:
+    """
+    Build the Flux query template selecting fields of a bucket.
+
+    The filters only depend on the bucket, measurement and metrics, so they are
+    rendered once and cached; only the ``$start`` and ``$stop`` placeholders change
+    between calls.
+
+    Args:
+        bucket: Bucket name
+        measurement: Optional measurement name to filter by
+        metrics: Metrics (field keys) to select
+
+    Returns:
+        string.Template: The query template
+    """
+    # Construct measurement filter
+    measurement_filter = ""
+    if measurement:
+        measurement_filter = f' |> filter(fn: (r) => r._measurement == "{measurement}")'
+
+    # Construct field filter for metrics
+    metrics_str = ", ".join([f'"{m}"' for m in metrics])
+    field_filter = f" |> filter(fn: (r) => contains(value: r._field, set: [{metrics_str}]))"
+
+    # Construct the complete query; "$" in names is escaped so only the range
+    # placeholders are substituted
+    return string.Template(
+        f"""
+            from(bucket: "{bucket.replace("$", "$$")}")
+             |> range(start: $start, stop: $stop)
+            {measurement_filter.replace("$", "$$")}
+            {field_filter.replace("$", "$$")}
+        """
+    )
 
 
 class InfluxDBSource(DataSource):
@@ -18,6 +94,10 @@ class InfluxDBSource(DataSource):
     Data source adapter for InfluxDB.
     """
 
+    # Clients shared by all sources, keyed by (url, org, token), so their
+    # connection pools survive across sources and get_data calls
+    _clients: Dict[Tuple[str, str, str], "InfluxDBClient"] = {}
+
     def __init__(
         self,
         url: str,
@@ -25,6 +105,9 @@ class InfluxDBSource(DataSource):
         org: str,
         bucket: str,
         measurement: Optional[str] = None,
+        dtype_policy: str = "float64",
+        use_arrow: bool = False,
+        cache_granularity: Optional[timedelta] = timedelta(minutes=1),
     ):
         """
         Initialize an InfluxDB data source.
@@ -35,44 +118,133 @@ class InfluxDBSource(DataSource):
             org: Organization name
             bucket: Bucket name
             measurement: Optional measurement name to filter by
+            dtype_policy: dtype of numeric value columns, "float64" or "float32".
+                float32 halves the memory of values but loses precision on large counters.
+            use_arrow: If True, fetch the raw CSV response and parse it with Arrow's
+                multithreaded CSV reader instead of the client's Python parser. All
+                selected fields must have the same type, since the result is read as a
+                single table.
+            cache_granularity: Query bounds are widened to multiples of this step, so
+                queries issued moments apart have identical text and can be served by
+                server-side and proxy caches. The result is trimmed back to the
+                requested range. None sends the exact bounds.
+
+        Raises:
+            ValueError: If the dtype policy is not supported
         """
+        if dtype_policy not in VALUE_DTYPES:
+            raise ValueError(
+                f"Unsupported dtype policy: {dtype_policy}. Available: {', '.join(VALUE_DTYPES)}"
+            )
         self.url = url
         self.token = token
         self.org = org
         self.bucket = bucket
         self.measurement = measurement
+        self.dtype_policy = dtype_policy
+        self.use_arrow = use_arrow
+        self.cache_granularity = cache_granularity
         self.client = None
-
-    def connect(self) -> None:
+        # (session, client) of the async client shared by the get_data_async calls of
+        # one extract_parallel run
+        self._async_client: Optional[Tuple["aiohttp.ClientSession", "InfluxDBClientAsync"]] = None
+        # (fetch time, metric names) of the last get_metrics call
+        self._metrics_cache: Optional[Tuple[float, List[str]]] = None
+        self._metrics_ttl = 60.0
+
+    def connect(self, session: Optional[requests.Session] = None) -> None:
         """
         Establish connection to the InfluxDB server.
 
+        Args:
+            session: Accepted for interface compatibility. The InfluxDB client
+                manages its own urllib3 connection pool, so the session is not used.
+                Instead, clients are cached per server, organization and token and
+                closed at process exit.
+
         Raises:
             ConnectionError: If connection to InfluxDB fails
+            ImportError: If influxdb-client is not installed
         """
         try:
-            self.client = InfluxDBClient(
-                url=self.url,
-                token=self.token,
-                org=self.org,
-            )
+            self.client = self._get_client(self.url, self.org, self.token)
             # Test connection by querying health
             health = self.client.health()
             if health.status != "pass":
                 raise ConnectionError(f"InfluxDB health check failed: {health.message}")
+        except ImportError:
+            raise
         except Exception as e:
             raise ConnectionError(f"Failed to connect to InfluxDB: {e}") from e
 
+    @classmethod
+    def _get_client(cls, url: str, org: str, token: str) -> "InfluxDBClient":
+        """
+        Get the shared client for a server, creating it on first use.
+
+        Args:
+            url: URL of the InfluxDB server
+            org: Organization name
+            token: API token for authentication
+
+        Returns:
+            InfluxDBClient: The cached client
+
+        Raises:
+            ImportError: If influxdb-client is not installed
+        """
+        key = (url, org, token)
+        client = cls._clients.get(key)
+        if client is None:
+            # Imported on first use so Prometheus-only callers do not pay for the SDK
+            try:
+                from influxdb_client import InfluxDBClient
+            except ImportError as e:
+                raise ImportError(
+                    "InfluxDBSource requires the influxdb-client package: "
+                    "pip install influxdb-client"
+                ) from e
+
+            if not cls._clients:
+                atexit.register(cls._close_clients)
+            client = InfluxDBClient(
+                url=url,
+                token=token,
+                org=org,
+                enable_gzip=True,
+                timeout=30_000,
+            )
+            cls._clients[key] = client
+        return client
+
+    @classmethod
+    def _close_clients(cls) -> None:
+        """
+        Close all shared clients. Registered to run at process exit.
+        """
+        for client in cls._clients.values():
+            client.close()
+        cls._clients.clear()
+
     def get_metrics(self) -> List[str]:
         """
         Get list of available metrics from InfluxDB.
 
+        The list is cached for ``_metrics_ttl`` seconds; call
+        invalidate_metrics_cache to force a refresh.
+
         Returns:
             List[str]: List of metric names (field keys)
 
         Raises:
             ConnectionError: If connection to InfluxDB fails
         """
+        if (
+            self._metrics_cache is not None
+            and time.monotonic() - self._metrics_cache[0] < self._metrics_ttl
+        ):
+            return self._metrics_cache[1]
+
         if not self.client:
             self.connect()
 
@@ -95,11 +267,18 @@ class InfluxDBSource(DataSource):
             for table in result:
                 for record in table.records:
                     metrics.append(record.values.get("_value"))
-
-            return metrics
         except Exception as e:
             raise ConnectionError(f"Failed to get metrics from InfluxDB: {e}") from e
 
+        self._metrics_cache = (time.monotonic(), metrics)
+        return metrics
+
+    def invalidate_metrics_cache(self) -> None:
+        """
+        Drop the cached metric list so the next get_metrics call queries InfluxDB.
+        """
+        self._metrics_cache = None
+
     def get_data(
         self,
         metrics: Optional[List[str]],
@@ -121,12 +300,103 @@ class InfluxDBSource(DataSource):
             ConnectionError: If connection to InfluxDB fails
             ValueError: If the specified metrics or time range is invalid
         """
-        if not self.client:
-            self.connect()
+        if metrics is None:
+            metrics = self.get_metrics()
+        query, from_time_utc, to_time_utc = self._prepare_query(metrics, from_time, to_time)
 
-        # If no metrics specified, get all metrics
+        try:
+            # Ensure client is connected
+            if not self.client:
+                self.connect()
+                
+            if self.use_arrow:
+                df = self._query_arrow(query)
+            else:
+                # Execute the query, letting the client parse the CSV response into
+                # DataFrames chunk by chunk
+                df = self._frames_to_dataframe(
+                    self.client.query_api().query_data_frame_stream(query, org=self.org)
+                )
+            df = self._trim(df, from_time_utc, to_time_utc)
+
+            if df.empty:
+                logger.warning(
+                    "No data found for %s in the requested time range, widen "
+                    "from_time/to_time to include more data",
+                    metrics,
+                )
+
+            return df
+        except Exception as e:
+            raise ConnectionError(f"Failed to get data from InfluxDB: {e}") from e
+
+    def iter_data(
+        self,
+        metrics: Optional[List[str]],
+        from_time: Optional[datetime],
+        to_time: Optional[datetime],
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Get data for specified metrics and time range from InfluxDB as chunks.
+
+        Yields the DataFrames parsed by the client's streaming query API as they
+        arrive, usually one per series, without concatenating them. With
+        ``use_arrow`` the response is parsed as a whole and yielded as one chunk.
+
+        Args:
+            metrics: List of metrics to extract. If None, extract all available metrics.
+            from_time: Start time for the extraction. If None, use the earliest available time.
+            to_time: End time for the extraction. If None, use the latest available time.
+
+        Yields:
+            pd.DataFrame: Chunks of the extracted metrics data
+
+        Raises:
+            ConnectionError: If connection to InfluxDB fails
+            ValueError: If the specified metrics or time range is invalid
+        """
         if metrics is None:
             metrics = self.get_metrics()
+        query, from_time_utc, to_time_utc = self._prepare_query(metrics, from_time, to_time)
+
+        try:
+            if self.use_arrow:
+                frames = iter([self._query_arrow(query)])
+            else:
+                frames = (
+                    self._to_layout(frame)
+                    for frame in self.client.query_api().query_data_frame_stream(
+                        query, org=self.org
+                    )
+                    if not frame.empty
+                )
+            for frame in frames:
+                frame = self._trim(frame, from_time_utc, to_time_utc)
+                if not frame.empty:
+                    yield frame
+        except Exception as e:
+            raise ConnectionError(f"Failed to get data from InfluxDB: {e}") from e
+
+    def _prepare_query(
+        self,
+        metrics: List[str],
+        from_time: Optional[datetime],
+        to_time: Optional[datetime],
+    ) -> Tuple[str, datetime, datetime]:
+        """
+        Connect if needed and build the query for a time range, filling in defaults.
+
+        Args:
+            metrics: List of metrics (field keys) to select
+            from_time: Start time, or None to use one hour before the end time
+            to_time: End time, or None to use the current time
+
+        Returns:
+            Tuple[str, datetime, datetime]: The Flux query, with its range widened to
+            the cache granularity, and the requested start and end times in UTC
+        """
+        if not self.client:
+            self.connect()
 
         # Default time range if not specified
         if to_time is None:
@@ -141,161 +411,391 @@ class InfluxDBSource(DataSource):
 
         logger.info("Using UTC time range: %s to %s", from_time_utc, to_time_utc)
 
-        # Construct time range filters
-        time_range_filter = ""
-        if from_time_utc is not None:
-            from_time_str = from_time_utc.strftime("%Y-%m-%dT%H:%M:%SZ")
-            time_range_filter += f" |> range(start: {from_time_str}"
+        query = self._build_query(metrics, *self._query_bounds(from_time_utc, to_time_utc))
+
+        logger.info("Executing Flux query: %s", query)
+        return query, from_time_utc, to_time_utc
+
+    async def get_data_async(
+        self,
+        session: "aiohttp.ClientSession",
+        metrics: Optional[List[str]],
+        from_time: Optional[datetime],
+        to_time: Optional[datetime],
+    ) -> pd.DataFrame:
+        """
+        Asynchronous counterpart of get_data that queries every metric concurrently.
+
+        Uses ``InfluxDBClientAsync`` when the async extra of influxdb-client is
+        installed; otherwise the blocking get_data runs in the default executor.
+        Calls made with the same session share one async client and its connection
+        pool, until close_async is called.
+
+        Args:
+            session: The session of the extraction run. The async InfluxDB client
+                manages its own aiohttp session, so it only identifies the run whose
+                calls share a client. If None, a client is opened for this call only.
+            metrics: List of metrics to extract. If None, extract all available metrics.
+            from_time: Start time for the extraction. If None, use the earliest available time.
+            to_time: End time for the extraction. If None, use the latest available time.
+
+        Returns:
+            pd.DataFrame: A DataFrame containing the extracted metrics data
+
+        Raises:
+            ConnectionError: If connection to InfluxDB fails
+            ValueError: If the specified metrics or time range is invalid
+        """
+        try:
+            from influxdb_client.client.influxdb_client_async import InfluxDBClientAsync
+        except ImportError:  # needs the influxdb-client[async] extra
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.get_data, metrics, from_time, to_time)
+
+        # If no metrics specified, get all metrics
+        if metrics is None:
+            metrics = self.get_metrics()
+
+        if to_time is None:
+            to_time = datetime.now(timezone.utc)
+        if from_time is None:
+            from_time = to_time - timedelta(hours=1)
+        from_time_utc = self._ensure_utc(from_time)
+        to_time_utc = self._ensure_utc(to_time)
+
+        # Format the range once, it is shared by every metric's query
+        start, stop = self._query_bounds(from_time_utc, to_time_utc)
+
+        try:
+            if session is None:
+                async with InfluxDBClientAsync(
+                    url=self.url, token=self.token, org=self.org, enable_gzip=True
+                ) as client:
+                    results = await self._query_frames_async(client, metrics, start, stop)
+            else:
+                client = self._get_async_client(session, InfluxDBClientAsync)
+                results = await self._query_frames_async(client, metrics, start, stop)
+        except Exception as e:
+            raise ConnectionError(f"Failed to get data from InfluxDB: {e}") from e
+
+        # query_data_frame returns a list when the result has tables of different shapes
+        df = self._frames_to_dataframe(
+            frame
+            for result in results
+            for frame in (result if isinstance(result, list) else [result])
+        )
+        return self._trim(df, from_time_utc, to_time_utc)
+
+    def _get_async_client(
+        self, session: "aiohttp.ClientSession", client_type: type
+    ) -> "InfluxDBClientAsync":
+        """
+        Get the async client of an extraction run, creating it on first use.
+
+        Must be called from the run's event loop, which the client is bound to.
+
+        Args:
+            session: The session identifying the extraction run
+            client_type: The InfluxDBClientAsync class
+
+        Returns:
+            InfluxDBClientAsync: The client shared by the calls of the run
+        """
+        if self._async_client is None or self._async_client[0] is not session:
+            # A client of a previous run is bound to that run's closed event loop
+            self._async_client = (
+                session,
+                client_type(url=self.url, token=self.token, org=self.org, enable_gzip=True),
+            )
+        return self._async_client[1]
+
+    async def _query_frames_async(
+        self, client: "InfluxDBClientAsync", metrics: List[str], start: str, stop: str
+    ) -> List:
+        """
+        Query every metric concurrently with an async client.
+
+        Args:
+            client: The async client
+            metrics: List of metrics (field keys) to query
+            start: Start of the range, formatted with _flux_time
+            stop: End of the range, formatted with _flux_time
+
+        Returns:
+            List: The result of each metric's query
+        """
+        query_api = client.query_api()
+        return await asyncio.gather(
+            *(
+                query_api.query_data_frame(self._build_query([metric], start, stop), org=self.org)
+                for metric in metrics
+            )
+        )
+
+    async def close_async(self) -> None:
+        """
+        Close the async client of the current extraction run, if any.
+
+        Called by MetricsExtractor at the end of an extract_parallel run, from the
+        run's event loop.
+        """
+        if self._async_client is not None:
+            _, client = self._async_client
+            self._async_client = None
+            await client.close()
+
+    def get_data_batch(
+        self,
+        metrics: List[str],
+        from_time: Optional[datetime],
+        to_time: Optional[datetime],
+    ) -> pd.DataFrame:
+        """
+        Get data for several metrics from InfluxDB with a single Flux query.
+
+        Args:
+            metrics: List of metrics (field keys) to extract.
+            from_time: Start time for the extraction. If None, use the earliest available time.
+            to_time: End time for the extraction. If None, use the latest available time.
+
+        Returns:
+            pd.DataFrame: A DataFrame containing the data of all requested metrics,
+            with a ``__name__`` column holding the metric each row belongs to
+
+        Raises:
+            ConnectionError: If connection to InfluxDB fails
+            ValueError: If the specified metrics or time range is invalid
+        """
+        # The field filter already matches every requested field in one query
+        df = self.get_data(metrics, from_time, to_time)
+        return df.assign(__name__=df["metric"])
+
+    def get_time_bounds(
+        self,
+        metrics: List[str],
+    ) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """
+        Get the times of the earliest and latest samples of the specified metrics.
+
+        Uses ``first()`` and ``last()`` selectors, which InfluxDB evaluates per series
+        in the storage engine, so only one row per series is returned.
+
+        Args:
+            metrics: List of metrics (field keys) to inspect.
 
-            if to_time_utc is not None:
-                to_time_str = to_time_utc.strftime("%Y-%m-%dT%H:%M:%SZ")
-                time_range_filter += f", stop: {to_time_str}"
+        Returns:
+            Tuple[Optional[datetime], Optional[datetime]]: The earliest and latest sample
+            times in UTC, or (None, None) if there is no data.
 
-            time_range_filter += ")"
-        elif to_time_utc is not None:
-            to_time_str = to_time_utc.strftime("%Y-%m-%dT%H:%M:%SZ")
-            time_range_filter += f" |> range(stop: {to_time_str})"
+        Raises:
+            ConnectionError: If connection to InfluxDB fails
+        """
+        if not self.client:
+            self.connect()
 
-        # Construct measurement filter
         measurement_filter = ""
         if self.measurement:
             measurement_filter = f' |> filter(fn: (r) => r._measurement == "{self.measurement}")'
-
-        # Construct field filter for metrics
         metrics_str = ", ".join([f'"{m}"' for m in metrics])
         field_filter = f" |> filter(fn: (r) => contains(value: r._field, set: [{metrics_str}]))"
 
-        # Construct the complete query
-        query = f"""
-            from(bucket: "{self.bucket}")
-            {time_range_filter}
-            {measurement_filter}
-            {field_filter}
+        bounds = []
+        for selector, descending in (("first", "false"), ("last", "true")):
+            query = f"""
+                from(bucket: "{self.bucket}")
+                |> range(start: 0)
+                {measurement_filter}
+                {field_filter}
+                |> {selector}()
+                |> group()
+                |> sort(columns: ["_time"], desc: {descending})
+                |> limit(n: 1)
+            """
+            try:
+                result = self.client.query_api().query(query, org=self.org)
+            except Exception as e:
+                raise ConnectionError(f"Failed to get time bounds from InfluxDB: {e}") from e
+
+            times = [record.get_time() for table in result for record in table.records]
+            if not times:
+                return None, None
+            bounds.append(times[0])
+
+        return bounds[0], bounds[1]
+
+    def _query_bounds(self, from_time_utc: datetime, to_time_utc: datetime) -> Tuple[str, str]:
         """
+        Format the range of a query, widened to the cache granularity.
 
-        logger.info("Executing Flux query: %s", query)
+        Args:
+            from_time_utc: Requested start of the range in UTC
+            to_time_utc: Requested end of the range in UTC
 
-        try:
-            # Ensure client is connected
-            if not self.client:
-                self.connect()
-                
-            # Execute the query
-            result = self.client.query_api().query(query, org=self.org)
+        Returns:
+            Tuple[str, str]: The start and stop Flux time literals
+        """
+        if self.cache_granularity:
+            from_time_utc = floor_time(from_time_utc, self.cache_granularity)
+            to_time_utc = ceil_time(to_time_utc, self.cache_granularity)
+        return _flux_time(from_time_utc), _flux_time(to_time_utc)
 
-            # Convert the result to a DataFrame
-            df = self._flux_to_dataframe(result)
-            
-            # If empty, try with a more generous time range
-            if df.empty:
-                logger.warning("No data found, trying with extended time range")
-                # Try with extended time range (1 day before and after)
-                extended_from = from_time_utc - timedelta(days=1)
-                extended_to = to_time_utc + timedelta(days=1)
-                
-                # Create a new query with extended time range
-                ext_from_str = extended_from.strftime("%Y-%m-%dT%H:%M:%SZ")
-                ext_to_str = extended_to.strftime("%Y-%m-%dT%H:%M:%SZ")
-                
-                extended_query = f"""
-                    from(bucket: "{self.bucket}")
-                    |> range(start: {ext_from_str}, stop: {ext_to_str})
-                    {measurement_filter}
-                    {field_filter}
-                """
-                
-                logger.info("Trying extended time range: %s to %s", extended_from, extended_to)
-                logger.info("Extended query: %s", extended_query)
-                
-                # Ensure client is connected
-                if not self.client:
-                    self.connect()
-                    
-                result = self.client.query_api().query(extended_query, org=self.org)
-                df = self._flux_to_dataframe(result)
-                
-                # Filter the results to match the original time range as closely as possible
-                if not df.empty:
-                    from_timestamp = from_time_utc.timestamp()
-                    to_timestamp = to_time_utc.timestamp()
-                    
-                    # Convert index to Unix timestamps for comparison
-                    unix_timestamps = df.index.map(lambda x: x.timestamp())
-                    
-                    # Use a more relaxed filter - get data within original time frame if possible
-                    # otherwise keep all data from extended query
-                    in_range = (unix_timestamps >= from_timestamp) & (unix_timestamps <= to_timestamp)
-                    if in_range.any():
-                        df = df[in_range]
-            
+    def _trim(
+        self,
+        df: pd.DataFrame,
+        from_time_utc: datetime,
+        to_time_utc: datetime,
+    ) -> pd.DataFrame:
+        """
+        Drop the rows fetched only because the query range was widened.
+
+        Args:
+            df: Result of a query built with _query_bounds
+            from_time_utc: Requested start of the range in UTC
+            to_time_utc: Requested end of the range in UTC
+
+        Returns:
+            pd.DataFrame: The rows within the requested range
+        """
+        if not self.cache_granularity or df.empty:
             return df
-        except Exception as e:
-            raise ConnectionError(f"Failed to get data from InfluxDB: {e}") from e
+        return df[(df.index >= from_time_utc) & (df.index < to_time_utc)]
+
+    def _build_query(self, metrics: List[str], start: str, stop: str) -> str:
+        """
+        Build the Flux query selecting the specified fields in a time range.
+
+        Args:
+            metrics: List of metrics (field keys) to select
+            start: Start of the range, formatted with _flux_time
+            stop: End of the range, formatted with _flux_time
+
+        Returns:
+            str: The Flux query
+        """
+        template = _flux_query_template(self.bucket, self.measurement, tuple(metrics))
+        return template.substitute(start=start, stop=stop)
+
+    def _query_arrow(self, query: str) -> pd.DataFrame:
+        """
+        Run a query and parse its raw CSV response with Arrow.
 
-    def _flux_to_dataframe(self, tables: List[FluxTable]) -> pd.DataFrame:
+        The series are merged into a single table with ``group()`` so the response
+        has one CSV header, and only the needed columns are converted to pandas.
+
+        Args:
+            query: The Flux query
+
+        Returns:
+            pd.DataFrame: A DataFrame in the same layout as _frames_to_dataframe
         """
-        Convert Flux query result to a pandas DataFrame.
+        # Only the opt-in Arrow path needs pyarrow
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+        from influxdb_client import Dialect
+
+        response = self.client.query_api().query_raw(
+            query + " |> group()",
+            org=self.org,
+            dialect=Dialect(header=True, annotations=[]),
+        )
+        data = response.data
+        if not data.strip():
+            logger.debug("No records found in query result")
+            return pd.DataFrame(columns=["metric", "value"])
+
+        table = pa_csv.read_csv(
+            pa.BufferReader(data),
+            read_options=pa_csv.ReadOptions(block_size=8 << 20),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={"_time": pa.timestamp("ns", tz="UTC")}
+            ),
+        )
+        table = table.select(
+            [
+                column
+                for column in table.column_names
+                if column in ("_time", "_value", "_field") or self._is_tag(column)
+            ]
+        )
+        return self._to_layout(table.to_pandas())
+
+    def _frames_to_dataframe(self, frames: Iterable[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Convert the DataFrames returned by the client's DataFrame query API to the
+        extractor's layout.
 
         Args:
-            tables: List of FluxTable objects from the query result
+            frames: DataFrames with the raw Flux columns (``_time``, ``_value``,
+                ``_field``, tags and bookkeeping columns)
 
         Returns:
-            pd.DataFrame: A DataFrame containing the query result
-        """
-        # Extract records from all tables
-        records = []
-        for table in tables:
-            for record in table.records:
-                # Extract the values
-                record_dict = {
-                    "timestamp": record.get_time(),
-                    "value": record.get_value(),
-                    "metric": record.values.get("_field"),
-                }
-
-                # Add tags as columns
-                for key, value in record.values.items():
-                    if key.startswith("_"):
-                        # Skip internal fields
-                        continue
-                    record_dict[key] = value
-
-                records.append(record_dict)
-
-        # Create DataFrame
-        if records:
-            df = pd.DataFrame(records)
-            logger.info("Created DataFrame with %d records", len(records))
-
-            # Set timestamp as index
-            df.set_index("timestamp", inplace=True)
+            pd.DataFrame: A DataFrame indexed by timestamp with ``value``, ``metric``
+            and one categorical column per tag
+        """
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            # Return empty DataFrame with proper columns
+            logger.debug("No records found in query result")
+            return pd.DataFrame(columns=["metric", "value"])
 
-            return df
-        # Return empty DataFrame with proper columns
-        logger.warning("No records found in query result")
-        return pd.DataFrame(columns=["metric", "value"])
+        return self._to_layout(pd.concat(frames, ignore_index=True))
+
+    @staticmethod
+    def _is_tag(column: str) -> bool:
+        """
+        Check whether a result column is a tag, rather than an internal Flux column
+        or one of the bookkeeping columns added by the client.
+
+        Args:
+            column: The column name
+
+        Returns:
+            bool: True if the column is a tag
+        """
+        return bool(column) and not column.startswith("_") and column not in ("result", "table")
+
+    def _to_layout(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Convert a DataFrame with the raw Flux columns to the extractor's layout.
+
+        Args:
+            df: DataFrame with ``_time``, ``_value``, ``_field`` and tag columns
+
+        Returns:
+            pd.DataFrame: A DataFrame indexed by timestamp with ``value``, ``metric``
+            and one categorical column per tag
+        """
+        # Keep tags, drop internal fields and the client's bookkeeping columns
+        tags = [column for column in df.columns if self._is_tag(column)]
+        df = df[["_time", "_value", "_field", *tags]].rename(
+            columns={"_time": "timestamp", "_value": "value", "_field": "metric"}
+        )
+
+        # Field and tag values repeat for every sample, store them as categories
+        conversions = {column: "category" for column in ("metric", *tags)}
+        # String and boolean fields keep their dtype
+        if pd.api.types.is_float_dtype(df["value"]):
+            conversions["value"] = self.dtype_policy
+        df = df.astype(conversions)
+        logger.info("Created DataFrame with %d records", len(df))
+
+        # Set timestamp as index
+        return df.set_index("timestamp")
 
     def _ensure_utc(self, dt: datetime) -> datetime:
         """
         Ensure a datetime object is in UTC timezone.
-        
+
+        Naive datetimes are assumed to be in local time. ``astimezone`` resolves the
+        local offset for the datetime itself, so daylight saving time is honored
+        without looking up the current local timezone on every call.
+
         Args:
             dt: The datetime object to convert
-            
+
         Returns:
             datetime: The datetime object in UTC timezone
         """
         if dt is None:
             return None
-            
-        # If the datetime has no timezone info, assume it's in local time and convert to UTC
-        if dt.tzinfo is None:
-            # Convert naive datetime to UTC by assuming it's in local time
-            local_dt = dt.replace(tzinfo=datetime.now().astimezone().tzinfo)
-            return local_dt.astimezone(timezone.utc)
-        elif dt.tzinfo != timezone.utc:
-            # If it has timezone info but not UTC, convert to UTC
-            return dt.astimezone(timezone.utc)
-            
-        # Already in UTC
-        return dt
+        return dt.astimezone(timezone.utc)
@@ -2,16 +2,155 @@
 Prometheus data source adapter.
 """
 
-from datetime import datetime, timedelta
+import asyncio
+import concurrent.futures
+import logging
+from datetime import datetime, timedelta, timezone
 import re
-from typing import Dict, List, Optional
+import time
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 import requests
-from prometheus_api_client import PrometheusConnect
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+try:
+    import aiohttp
+except ImportError:  # aiohttp is optional, only needed for get_data_async
+    aiohttp = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, speeds up decoding large async responses
+    orjson = None
+
+from metrics_extractor.core.cache import ceil_time, floor_time
 from metrics_extractor.core.datasource import DataSource
-from metrics_extractor.core.logging import logger
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of queries sent concurrently for metrics that cannot be merged
+MAX_CONCURRENT_QUERIES = 8
+
+# Supported dtypes of the value column
+VALUE_DTYPES = ("float64", "float32")
+
+# Plain metric names, which can be fetched together with a single __name__ regex selector
+_METRIC_NAME_PATTERN = re.compile(r"[a-zA-Z_:][a-zA-Z0-9_:]*")
+
+# Function calls like rate(), sum(), etc.
+_FUNCTION_PATTERN = re.compile(r"[a-zA-Z_:][a-zA-Z0-9_:]*\(")
+
+
+def _to_utc_datetimes(timestamps: np.ndarray) -> pd.DatetimeIndex:
+    """
+    Convert Prometheus sample timestamps to UTC datetimes.
+
+    Prometheus returns float seconds with millisecond precision. Rounding to integer
+    milliseconds first avoids float noise in the resulting int64 nanoseconds, so the
+    values are stored as native TIMESTAMP columns by Parquet/Arrow.
+
+    Args:
+        timestamps: Sample timestamps in seconds since the epoch
+
+    Returns:
+        pd.DatetimeIndex: The timestamps as timezone-aware UTC datetimes
+    """
+    millis = np.round(timestamps * 1000).astype("int64")
+    return pd.to_datetime(millis, unit="ms", utc=True)
+
+
+class _Series(NamedTuple):
+    """Raw samples of one returned series, kept as arrays until the final DataFrame."""
+
+    metric: str
+    labels: Dict[str, str]
+    timestamps: np.ndarray
+    values: np.ndarray
+
+
+def _parse_samples(values: List[list]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Split the ``[timestamp, "value"]`` pairs of the API into two arrays.
+
+    Both arrays are filled in a single pass each, straight from the pairs, without
+    intermediate lists or DataFrames.
+
+    Args:
+        values: Sample pairs as returned by the API
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Timestamps in seconds and float values
+    """
+    count = len(values)
+    timestamps = np.fromiter((sample[0] for sample in values), dtype=np.float64, count=count)
+    samples = np.fromiter((float(sample[1]) for sample in values), dtype=np.float64, count=count)
+    return timestamps, samples
+
+
+def _repeat_categorical(per_series: List[Optional[str]], lengths: List[int]) -> pd.Categorical:
+    """
+    Expand one value per series into a categorical column covering every sample.
+
+    Only the integer codes are repeated, so no per-sample Python strings are created.
+
+    Args:
+        per_series: The value of each series, None where a series has no value
+        lengths: Number of samples of each series
+
+    Returns:
+        pd.Categorical: The column, with missing values where a series had None
+    """
+    categories = list(dict.fromkeys(value for value in per_series if value is not None))
+    lookup = {value: code for code, value in enumerate(categories)}
+    codes = np.array(
+        [lookup[value] if value is not None else -1 for value in per_series],
+        dtype=np.int32,
+    )
+    return pd.Categorical.from_codes(np.repeat(codes, lengths), categories=categories)
+
+
+def _series_to_dataframe(
+    series: List[_Series],
+    names: Optional[List[str]] = None,
+    value_dtype: str = "float64",
+) -> pd.DataFrame:
+    """
+    Build a single DataFrame from the raw arrays of several series.
+
+    Concatenating the arrays of every series and building one DataFrame avoids
+    creating (and then concatenating) one small DataFrame per series. The metric
+    and label columns are categorical, since they repeat for every sample.
+
+    Args:
+        series: The series to combine
+        names: Optional requested metric of each series, stored in a ``__name__`` column
+        value_dtype: dtype of the value column
+
+    Returns:
+        pd.DataFrame: A DataFrame indexed by timestamp, with ``value``, ``metric`` and
+        one column per label. Series without a label hold NaN in its column.
+    """
+    if not series:
+        columns = ["metric", "value"] if names is None else ["metric", "value", "__name__"]
+        return pd.DataFrame(columns=columns)
+
+    lengths = [len(s.timestamps) for s in series]
+    columns = {
+        "value": np.concatenate([s.values for s in series]).astype(value_dtype, copy=False),
+        "metric": _repeat_categorical([s.metric for s in series], lengths),
+    }
+    label_names = dict.fromkeys(label for s in series for label in s.labels)
+    for label in label_names:
+        columns[label] = _repeat_categorical([s.labels.get(label) for s in series], lengths)
+    if names is not None:
+        columns["__name__"] = np.repeat(np.array(names, dtype=object), lengths)
+
+    index = _to_utc_datetimes(np.concatenate([s.timestamps for s in series]))
+    index.name = "timestamp"
+    return pd.DataFrame(columns, index=index)
 
 
 class PrometheusSource(DataSource):
@@ -19,12 +158,17 @@ class PrometheusSource(DataSource):
     Data source adapter for Prometheus.
     """
 
+    # Pooled session shared by all sources that are not given one explicitly
+    _shared_session: Optional[requests.Session] = None
+
     def __init__(
         self,
         url: str,
         auth: Optional[Dict[str, str]] = None,
         verify: bool = True,
         headers: Optional[Dict[str, str]] = None,
+        dtype_policy: str = "float64",
+        cache_granularity: Optional[timedelta] = timedelta(minutes=1),
     ):
         """
         Initialize a Prometheus data source.
@@ -34,49 +178,130 @@ class PrometheusSource(DataSource):
             auth: Authentication details (e.g., {"username": "user", "password": "pass"})
             verify: Whether to verify SSL certificates
             headers: Additional HTTP headers
+            dtype_policy: dtype of the value column, "float64" or "float32". float32
+                halves the memory of values but loses precision on large counters.
+            cache_granularity: Query bounds are widened to multiples of this step, so
+                queries issued moments apart have identical text and can be served by
+                caching proxies. The result is trimmed back to the requested range.
+                None sends the exact bounds.
+
+        Raises:
+            ValueError: If the dtype policy is not supported
         """
+        if dtype_policy not in VALUE_DTYPES:
+            raise ValueError(
+                f"Unsupported dtype policy: {dtype_policy}. Available: {', '.join(VALUE_DTYPES)}"
+            )
         self.url = url
         self.auth = auth
         self.verify = verify
         self.headers = headers if headers is not None else {}
+        self.dtype_policy = dtype_policy
+        self.cache_granularity = cache_granularity
         self.client = None
+        self.session = None
+        # (fetch time, metric names) of the last get_metrics call
+        self._metrics_cache: Optional[Tuple[float, List[str]]] = None
+        self._metrics_ttl = 60.0
 
-    def connect(self) -> None:
+    def connect(self, session: Optional[requests.Session] = None) -> None:
         """
         Establish connection to the Prometheus server.
 
+        Args:
+            session: Optional pooled HTTP session to reuse for all queries.
+                If None, a previously injected session is kept, or the session
+                shared by all Prometheus sources is used.
+
         Raises:
             ConnectionError: If connection to Prometheus fails
+            ImportError: If prometheus-api-client is not installed
         """
+        # Imported on first use so InfluxDB-only callers do not pay for the SDK
+        try:
+            from prometheus_api_client import PrometheusConnect
+        except ImportError as e:
+            raise ImportError(
+                "PrometheusSource requires the prometheus-api-client package: "
+                "pip install prometheus-api-client"
+            ) from e
+
+        if session is not None:
+            self.session = session
+        elif self.session is None:
+            self.session = self._get_shared_session()
+
         try:
             self.client = PrometheusConnect(
                 url=self.url,
                 headers=self.headers,
                 disable_ssl=not self.verify,
+                session=self.session,
             )
             # Test connection by fetching a simple metric
             self.client.get_current_metric_value("up")
         except Exception as e:
             raise ConnectionError(f"Failed to connect to Prometheus: {e}") from e
 
+    @classmethod
+    def _get_shared_session(cls) -> requests.Session:
+        """
+        Get the pooled HTTP session shared by all Prometheus sources.
+
+        Keeping one session per process lets every source reuse keep-alive
+        connections instead of paying a TCP/TLS handshake per query.
+
+        Returns:
+            requests.Session: The shared session, created on first use
+        """
+        if PrometheusSource._shared_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=32,
+                pool_maxsize=32,
+                max_retries=Retry(total=3, backoff_factor=0.2),
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            PrometheusSource._shared_session = session
+        return PrometheusSource._shared_session
+
     def get_metrics(self) -> List[str]:
         """
         Get list of available metrics from Prometheus.
 
+        The list is cached for ``_metrics_ttl`` seconds; call
+        invalidate_metrics_cache to force a refresh.
+
         Returns:
             List[str]: List of metric names
 
         Raises:
             ConnectionError: If connection to Prometheus fails
         """
+        if (
+            self._metrics_cache is not None
+            and time.monotonic() - self._metrics_cache[0] < self._metrics_ttl
+        ):
+            return self._metrics_cache[1]
+
         if not self.client:
             self.connect()
 
         try:
-            return self.client.all_metrics()
+            metrics = self.client.all_metrics()
         except Exception as e:
             raise ConnectionError(f"Failed to get metrics from Prometheus: {e}") from e
 
+        self._metrics_cache = (time.monotonic(), metrics)
+        return metrics
+
+    def invalidate_metrics_cache(self) -> None:
+        """
+        Drop the cached metric list so the next get_metrics call queries Prometheus.
+        """
+        self._metrics_cache = None
+
     def _is_function_query(self, query: str) -> bool:
         """
         Check if the query contains Prometheus functions.
@@ -87,9 +312,10 @@ class PrometheusSource(DataSource):
         Returns:
             bool: True if the query contains functions, False otherwise
         """
-        # Pattern to match functions like rate(), sum(), etc.
-        function_pattern = r'[a-zA-Z_:][a-zA-Z0-9_:]*\('
-        return bool(re.findall(function_pattern, query.strip()))
+        # Plain metric names and selectors never contain a parenthesis
+        if "(" not in query:
+            return False
+        return _FUNCTION_PATTERN.search(query) is not None
 
     def get_data(
         self,
@@ -101,7 +327,9 @@ class PrometheusSource(DataSource):
         Get data for specified metrics and time range from Prometheus.
 
         For simple metrics, uses range vector selectors to get all raw datapoints within the time range.
+        Plain metric names are merged into a single ``{__name__=~"m1|m2|..."}`` query.
         For function queries (e.g., rate(http_requests_total[5m])), uses query_range with 1s step.
+        Queries that cannot be merged are sent concurrently.
 
         Args:
             metrics: List of metrics to extract. If None, extract all available metrics.
@@ -115,170 +343,539 @@ class PrometheusSource(DataSource):
             ConnectionError: If connection to Prometheus fails
             ValueError: If the specified metrics or time range is invalid
         """
+        # If no metrics specified, get all metrics
+        if metrics is None:
+            metrics = self.get_metrics()
+
+        return _series_to_dataframe(
+            [s for _, s in self._fetch_series(metrics, from_time, to_time)],
+            value_dtype=self.dtype_policy,
+        )
+
+    def iter_data(
+        self,
+        metrics: Optional[List[str]],
+        from_time: Optional[datetime],
+        to_time: Optional[datetime],
+        chunk_size: timedelta = timedelta(hours=1),
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Get data for specified metrics and time range from Prometheus as chunks.
+
+        The time range is split into consecutive windows of ``chunk_size`` and the
+        data of each window is yielded as soon as it is fetched, so memory stays
+        bounded by the window size rather than the whole range.
+
+        Args:
+            metrics: List of metrics to extract. If None, extract all available metrics.
+            from_time: Start time for the extraction. If None, use the earliest available time.
+            to_time: End time for the extraction. If None, use the latest available time.
+            chunk_size: Duration of each window
+
+        Yields:
+            pd.DataFrame: Chunks of the extracted metrics data, in time order
+
+        Raises:
+            ConnectionError: If connection to Prometheus fails
+            ValueError: If the specified metrics or time range is invalid
+        """
+        if metrics is None:
+            metrics = self.get_metrics()
+        from_time, to_time = self._default_time_range(from_time, to_time)
+
+        last_timestamp = None
+        window_start = from_time
+        while window_start < to_time:
+            window_end = min(window_start + chunk_size, to_time)
+            df = self.get_data(metrics, window_start, window_end)
+            if last_timestamp is not None and not df.empty:
+                # Windows share their boundary, drop samples already yielded
+                df = df[df.index > last_timestamp]
+            if not df.empty:
+                last_timestamp = df.index.max()
+                yield df
+            window_start = window_end
+
+    def get_data_batch(
+        self,
+        metrics: List[str],
+        from_time: Optional[datetime],
+        to_time: Optional[datetime],
+    ) -> pd.DataFrame:
+        """
+        Get data for several metrics from Prometheus with as few queries as possible.
+
+        Uses the same query plan as get_data, and tags every row with the requested
+        metric it belongs to.
+
+        Args:
+            metrics: List of metrics to extract.
+            from_time: Start time for the extraction. If None, use the earliest available time.
+            to_time: End time for the extraction. If None, use the latest available time.
+
+        Returns:
+            pd.DataFrame: A DataFrame containing the data of all requested metrics,
+            with a ``__name__`` column holding the metric each row belongs to
+
+        Raises:
+            ConnectionError: If connection to Prometheus fails
+            ValueError: If the specified metrics or time range is invalid
+        """
+        fetched = self._fetch_series(metrics, from_time, to_time)
+        return _series_to_dataframe(
+            [s for _, s in fetched],
+            names=[metric for metric, _ in fetched],
+            value_dtype=self.dtype_policy,
+        )
+
+    def _fetch_series(
+        self,
+        metrics: List[str],
+        from_time: Optional[datetime],
+        to_time: Optional[datetime],
+    ) -> List[Tuple[str, _Series]]:
+        """
+        Fetch the data of several metrics with as few round trips as possible.
+
+        Plain metric names are fetched together with one range vector query. Selectors
+        with label filters and function queries cannot be merged into that selector, so
+        they are sent concurrently from a thread pool.
+
+        Args:
+            metrics: List of metrics to extract.
+            from_time: Start time for the extraction. If None, use one hour before to_time.
+            to_time: End time for the extraction. If None, use the current time.
+
+        Returns:
+            List[Tuple[str, _Series]]: The requested metric and each of its returned
+            series, in the order of the requested metrics
+        """
+        # Ensure client is initialized
+        if not self.client:
+            self.connect()
+
+        from_time, to_time = self._default_time_range(from_time, to_time)
+
+        plain_metrics = [m for m in metrics if _METRIC_NAME_PATTERN.fullmatch(m)]
+        if len(plain_metrics) < 2:
+            # Nothing to merge, fetch everything with individual queries
+            plain_metrics = []
+        other_metrics = [m for m in metrics if m not in plain_metrics]
+
+        series_by_metric: Dict[str, List[_Series]] = {}
+        if plain_metrics:
+            selector = '{__name__=~"%s"}' % "|".join(plain_metrics)
+            # Range vector results keep the metric name, which is the requested metric
+            for series in self._fetch_metric(selector, from_time, to_time):
+                series_by_metric.setdefault(series.metric, []).append(series)
+
+        if other_metrics:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(MAX_CONCURRENT_QUERIES, len(other_metrics))
+            ) as executor:
+                results = executor.map(
+                    lambda metric: self._fetch_metric(metric, from_time, to_time),
+                    other_metrics,
+                )
+                series_by_metric.update(zip(other_metrics, results))
+
+        return [
+            (metric, series)
+            for metric in metrics
+            for series in series_by_metric.get(metric, [])
+        ]
+
+    def _fetch_metric(
+        self,
+        metric: str,
+        from_time: datetime,
+        to_time: datetime,
+    ) -> List[_Series]:
+        """
+        Fetch the data of a single metric (or merged selector) from Prometheus.
+
+        Errors are logged and result in an empty list, so one failing metric
+        doesn't abort the whole extraction.
+
+        Args:
+            metric: The metric, selector or function query to fetch
+            from_time: Start time for the extraction
+            to_time: End time for the extraction
+
+        Returns:
+            List[_Series]: The returned series
+        """
+        requested_from, requested_to = from_time, to_time
+        from_time, to_time = self._query_bounds(from_time, to_time)
+        try:
+            if self._is_function_query(metric):
+                # Handle function queries with query_range and 1s step
+                logger.info("Handling function query: %s", metric)
+
+                # Use query_range for function queries with a 1s step
+                result = self.client.custom_query_range(
+                    query=metric,
+                    start_time=from_time,
+                    end_time=to_time,
+                    step="1s"  # 1 second resolution
+                )
+                return self._trim(
+                    self._function_result_to_series(metric, result), requested_from, requested_to
+                )
+
+            # Use the original approach for simple metrics with range vector
+            # Create the range vector query with the exact time range
+            range_query = self._range_vector_query(metric, from_time, to_time)
+            logger.info("Using range vector query: %s @ %s", range_query, to_time)
+
+            # Execute the query at the end time to get all data points in the range
+            result = self.client.custom_query(
+                query=range_query,
+                params={"time": to_time.timestamp()},
+            )
+            series = self._trim(
+                self._range_vector_result_to_series(result), requested_from, requested_to
+            )
+            if not series:
+                logger.warning(
+                    "No samples of %s in the requested time range, widen "
+                    "from_time/to_time to include more data",
+                    metric,
+                )
+            return series
+
+        except (ConnectionError, ValueError, IOError, requests.RequestException) as e:
+            # Log the error but continue with other metrics
+            logger.warning("Failed to get data for metric %s: %s", metric, e)
+            return []
+
+    def get_time_bounds(
+        self,
+        metrics: List[str],
+        lookback: timedelta = timedelta(days=15),
+    ) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """
+        Get the times of the earliest and latest samples of the specified metrics.
+
+        Uses two instant queries per metric over the lookback window,
+        ``min(min_over_time(timestamp(m)[lookback:1m]))`` for the earliest sample and
+        ``max(max_over_time(timestamp(m)[lookback:1m]))`` for the latest one, so no
+        sample data is transferred and metrics that stopped reporting are still found.
+
+        Args:
+            metrics: List of metrics to inspect.
+            lookback: How far back to look for samples. Defaults to the default
+                Prometheus retention of 15 days.
+
+        Returns:
+            Tuple[Optional[datetime], Optional[datetime]]: The earliest and latest sample
+            times in UTC, or (None, None) if there is no data.
+
+        Raises:
+            ConnectionError: If connection to Prometheus fails
+        """
         # Ensure client is initialized
         if not self.client:
             self.connect()
 
+        lookback_seconds = int(lookback.total_seconds())
+        earliest: Optional[float] = None
+        latest: Optional[float] = None
+
+        for metric in metrics:
+            try:
+                first_result = self.client.custom_query(
+                    query=f"min(min_over_time(timestamp({metric})[{lookback_seconds}s:1m]))"
+                )
+                # An instant query only sees the last 5 minutes, so the latest sample
+                # is also searched over the lookback window
+                last_result = self.client.custom_query(
+                    query=f"max(max_over_time(timestamp({metric})[{lookback_seconds}s:1m]))"
+                )
+            except (ConnectionError, ValueError, IOError, requests.RequestException) as e:
+                logger.warning("Failed to get time bounds for metric %s: %s", metric, e)
+                continue
+
+            if first_result:
+                value = float(first_result[0]["value"][1])
+                earliest = value if earliest is None else min(earliest, value)
+            if last_result:
+                value = float(last_result[0]["value"][1])
+                latest = value if latest is None else max(latest, value)
+
+        if earliest is None or latest is None:
+            return None, None
+        return (
+            datetime.fromtimestamp(earliest, tz=timezone.utc),
+            datetime.fromtimestamp(latest, tz=timezone.utc),
+        )
+
+    async def get_data_async(
+        self,
+        session: "aiohttp.ClientSession",
+        metrics: Optional[List[str]],
+        from_time: Optional[datetime],
+        to_time: Optional[datetime],
+    ) -> pd.DataFrame:
+        """
+        Asynchronous counterpart of get_data that issues the HTTP API requests
+        through a shared aiohttp session.
+
+        Args:
+            session: The aiohttp session used to issue the requests
+            metrics: List of metrics to extract. If None, extract all available metrics.
+            from_time: Start time for the extraction. If None, use the earliest available time.
+            to_time: End time for the extraction. If None, use the latest available time.
+
+        Returns:
+            pd.DataFrame: A DataFrame containing the extracted metrics data
+
+        Raises:
+            ConnectionError: If connection to Prometheus fails
+            ValueError: If the specified metrics or time range is invalid
+        """
         # If no metrics specified, get all metrics
         if metrics is None:
             metrics = self.get_metrics()
 
-        # Default time range if not specified
+        from_time, to_time = self._default_time_range(from_time, to_time)
+
+        # Issue one request per metric concurrently on the shared session
+        results = await asyncio.gather(
+            *(self._fetch_metric_async(session, metric, from_time, to_time) for metric in metrics)
+        )
+        return _series_to_dataframe(
+            [series for fetched in results for series in fetched],
+            value_dtype=self.dtype_policy,
+        )
+
+    async def _fetch_metric_async(
+        self,
+        session: "aiohttp.ClientSession",
+        metric: str,
+        from_time: datetime,
+        to_time: datetime,
+    ) -> List[_Series]:
+        """
+        Run the query for a single metric through the asynchronous HTTP API.
+
+        Args:
+            session: The aiohttp session used to issue the request
+            metric: Metric name, selector or function query
+            from_time: Start time for the extraction
+            to_time: End time for the extraction
+
+        Returns:
+            List[_Series]: The returned series, or an empty list if the query failed
+        """
+        requested_from, requested_to = from_time, to_time
+        from_time, to_time = self._query_bounds(from_time, to_time)
+        try:
+            if self._is_function_query(metric):
+                logger.info("Handling function query: %s", metric)
+                result = await self._query_async(
+                    session,
+                    "query_range",
+                    {
+                        "query": metric,
+                        "start": str(from_time.timestamp()),
+                        "end": str(to_time.timestamp()),
+                        "step": "1s",
+                    },
+                )
+                return self._trim(
+                    self._function_result_to_series(metric, result), requested_from, requested_to
+                )
+
+            range_query = self._range_vector_query(metric, from_time, to_time)
+            logger.info("Using range vector query: %s @ %s", range_query, to_time)
+            result = await self._query_async(
+                session,
+                "query",
+                {"query": range_query, "time": str(to_time.timestamp())},
+            )
+            return self._trim(
+                self._range_vector_result_to_series(result), requested_from, requested_to
+            )
+
+        except (ConnectionError, ValueError, IOError, aiohttp.ClientError) as e:
+            # Log the error but continue with other metrics
+            logger.warning("Failed to get data for metric %s: %s", metric, e)
+            return []
+
+    async def _query_async(
+        self,
+        session: "aiohttp.ClientSession",
+        endpoint: str,
+        params: Dict[str, str],
+    ) -> List[dict]:
+        """
+        Run a query against the Prometheus HTTP API.
+
+        Args:
+            session: The aiohttp session used to issue the request
+            endpoint: API endpoint name ("query" or "query_range")
+            params: Query string parameters
+
+        Returns:
+            List[dict]: The "result" list of the API response
+
+        Raises:
+            ConnectionError: If the server does not answer with a successful response
+        """
+        url = f"{self.url.rstrip('/')}/api/v1/{endpoint}"
+        async with session.get(
+            url,
+            params=params,
+            headers=self.headers,
+            ssl=None if self.verify else False,
+        ) as response:
+            if response.status != 200:
+                raise ConnectionError(
+                    f"HTTP Status Code {response.status} ({await response.text()})"
+                )
+            if orjson is not None:
+                # Decode the raw bytes directly, without building an intermediate str
+                payload = orjson.loads(await response.read())
+            else:
+                payload = await response.json()
+
+        return payload["data"]["result"]
+
+    def _default_time_range(
+        self,
+        from_time: Optional[datetime],
+        to_time: Optional[datetime],
+    ) -> Tuple[datetime, datetime]:
+        """
+        Fill in the default time range for unspecified bounds.
+
+        Args:
+            from_time: Start time, or None to use one hour before the end time
+            to_time: End time, or None to use the current time
+
+        Returns:
+            Tuple[datetime, datetime]: The resolved start and end times
+        """
         if to_time is None:
             to_time = datetime.now()
         if from_time is None:
             # Default to 1 hour ago if not specified
             from_time = to_time - timedelta(hours=1)
+        return from_time, to_time
 
-        all_data = []
+    def _query_bounds(self, from_time: datetime, to_time: datetime) -> Tuple[datetime, datetime]:
+        """
+        Widen a time range to the cache granularity.
 
-        for metric in metrics:
-            try:
-                # Calculate the time range duration in seconds
-                time_range_seconds = int((to_time - from_time).total_seconds())
-                
-                if self._is_function_query(metric):
-                    # Handle function queries with query_range and 1s step
-                    logger.info("Handling function query: %s", metric)
-                    
-                    # Use query_range for function queries with a 1s step
-                    # Ensure client is not None before calling custom_query_range
-                    if not self.client:
-                        self.connect()
-                    
-                    result = self.client.custom_query_range(
-                        query=metric,
-                        start_time=from_time,
-                        end_time=to_time,
-                        step="1s"  # 1 second resolution
-                    )
-                    
-                    # Process the results from query_range
-                    for item in result:
-                        # Extract the metric name and labels
-                        metric_name = metric  # Use the original query as the metric name
-                        labels = {k: v for k, v in item["metric"].items() if k != "__name__"}
-                        
-                        # Extract the values
-                        values = item.get("values", [])
-                        
-                        if values:
-                            # Create a DataFrame with timestamps and values
-                            df = pd.DataFrame(values, columns=["timestamp", "value"])
-                            
-                            # Convert timestamp to datetime
-                            df["timestamp"] = pd.to_datetime(df["timestamp"], unit="s")
-                            
-                            # Convert value to float
-                            df["value"] = df["value"].astype(float)
-                            
-                            # Set timestamp as index
-                            df.set_index("timestamp", inplace=True)
-                            
-                            # Add metric name and labels as columns
-                            df["metric"] = metric_name
-                            for label, value in labels.items():
-                                df[label] = value
-                            
-                            all_data.append(df)
-                else:
-                    # Use the original approach for simple metrics with range vector
-                    # Create the range vector query with the exact time range
-                    range_query = f"{metric}[{time_range_seconds}s]"
-                    logger.info("Using range vector query: %s @ %s", range_query, to_time)
-
-                    # Ensure client is not None before calling custom_query
-                    if not self.client:
-                        self.connect()
-                        
-                    # Execute the query at the end time to get all data points in the range
-                    result = self.client.custom_query(
-                        query=range_query,
-                        params={"time": to_time.timestamp()},
-                    )
-
-                    # Process the results
-                    for item in result:
-                        # Extract the metric name and labels
-                        metric_name = item["metric"]["__name__"]
-                        labels = {k: v for k, v in item["metric"].items() if k != "__name__"}
-
-                        # Extract the values (for range vectors, they're in the 'values' field)
-                        values = item.get("values", [])
-
-                        if values:
-                            # Create a DataFrame with timestamps and values
-                            df = pd.DataFrame(values, columns=["timestamp", "value"])
-
-                            # Convert timestamp to datetime without timezone
-                            df["timestamp"] = pd.to_datetime(df["timestamp"], unit="s")
-
-                            # Try to compare by converting timestamps to Unix timestamps (seconds since epoch)
-                            # This avoids timezone issues completely
-                            from_timestamp = from_time.timestamp()
-                            to_timestamp = to_time.timestamp()
-
-                            # Convert dataframe timestamps to Unix timestamps for comparison
-                            unix_timestamps = df["timestamp"].map(lambda x: x.timestamp())
-
-                            # Check how many are in range
-                            in_range = (unix_timestamps >= from_timestamp) & (
-                                unix_timestamps <= to_timestamp
-                            )
-
-                            # Apply the filter
-                            df = df[in_range]
-
-                            # If still empty after precise filtering, try with a more generous time
-                            # range
-                            if df.empty:
-                                logger.warning("No data after filtering. Using extended time range.")
-                                # Try with extended time range (1 hour before and after)
-                                extended_from = from_time - timedelta(hours=1)
-                                extended_to = to_time + timedelta(hours=1)
-                                logger.info("Extended range: %s to %s", extended_from, extended_to)
-
-                                # Convert to timestamps
-                                ext_from_ts = extended_from.timestamp()
-                                ext_to_ts = extended_to.timestamp()
-
-                                # Create new dataframe from original values
-                                df = pd.DataFrame(values, columns=["timestamp", "value"])
-                                df["timestamp"] = pd.to_datetime(df["timestamp"], unit="s")
-                                unix_timestamps = df["timestamp"].map(lambda x: x.timestamp())
-
-                                # Filter with extended range
-                                df = df[
-                                    (unix_timestamps >= ext_from_ts) & (unix_timestamps <= ext_to_ts)
-                                ]
-
-                                # If still empty, use all data as last resort
-                                if df.empty:
-                                    logger.warning(
-                                        "No data even with extended range. Using all available data."
-                                    )
-                                    df = pd.DataFrame(values, columns=["timestamp", "value"])
-                                    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="s")
-
-                            # Convert value to float
-                            df["value"] = df["value"].astype(float)
-
-                            # Set timestamp as index
-                            df.set_index("timestamp", inplace=True)
-
-                            # Add metric name and labels as columns
-                            df["metric"] = metric_name
-                            for label, value in labels.items():
-                                df[label] = value
-
-                            all_data.append(df)
+        Args:
+            from_time: Requested start time
+            to_time: Requested end time
 
-            except (ConnectionError, ValueError, IOError, requests.RequestException) as e:
-                # Log the error but continue with other metrics
-                logger.warning("Failed to get data for metric %s: %s", metric, e)
-
-        # Combine all DataFrames
-        if all_data:
-            return pd.concat(all_data)
-        # Return empty DataFrame with proper columns
-        return pd.DataFrame(columns=["metric", "value"])
+        Returns:
+            Tuple[datetime, datetime]: The start and end times to query
+        """
+        if not self.cache_granularity:
+            return from_time, to_time
+        return (
+            floor_time(from_time, self.cache_granularity),
+            ceil_time(to_time, self.cache_granularity),
+        )
+
+    def _trim(
+        self,
+        series: List[_Series],
+        from_time: datetime,
+        to_time: datetime,
+    ) -> List[_Series]:
+        """
+        Drop the samples fetched only because the query range was widened.
+
+        Args:
+            series: Series returned for a range built with _query_bounds
+            from_time: Requested start time
+            to_time: Requested end time
+
+        Returns:
+            List[_Series]: The series that have samples within the requested range
+        """
+        if not self.cache_granularity:
+            return series
+        start, end = from_time.timestamp(), to_time.timestamp()
+        trimmed = []
+        for s in series:
+            in_range = (s.timestamps >= start) & (s.timestamps <= end)
+            if in_range.all():
+                trimmed.append(s)
+            elif in_range.any():
+                trimmed.append(
+                    s._replace(timestamps=s.timestamps[in_range], values=s.values[in_range])
+                )
+        return trimmed
+
+    def _range_vector_query(self, metric: str, from_time: datetime, to_time: datetime) -> str:
+        """
+        Build the range vector selector covering the given time range.
+
+        Args:
+            metric: The metric selector
+            from_time: Start time of the range
+            to_time: End time of the range
+
+        Returns:
+            str: The range vector query
+        """
+        # Calculate the time range duration in seconds
+        time_range_seconds = int((to_time - from_time).total_seconds())
+        return f"{metric}[{time_range_seconds}s]"
+
+    def _function_result_to_series(self, metric: str, result: List[dict]) -> List[_Series]:
+        """
+        Convert the result of a function query (query_range) to raw series.
+
+        Args:
+            metric: The original query, used as the metric name
+            result: The "result" list returned by the API
+
+        Returns:
+            List[_Series]: The returned series that have samples
+        """
+        series = []
+        for item in result:
+            # Extract the labels, the original query is used as the metric name
+            labels = {k: v for k, v in item["metric"].items() if k != "__name__"}
+
+            # Extract the values
+            values = item.get("values", [])
+
+            if values:
+                timestamps, samples = _parse_samples(values)
+                series.append(_Series(metric, labels, timestamps, samples))
+        return series
+
+    def _range_vector_result_to_series(self, result: List[dict]) -> List[_Series]:
+        """
+        Convert the result of a range vector query to raw series.
+
+        The range selector already limits the samples to the requested window on
+        the server, so no filtering is done here.
+
+        Args:
+            result: The "result" list returned by the API
+
+        Returns:
+            List[_Series]: The returned series that have samples
+        """
+        series = []
+        for item in result:
+            # Extract the metric name and labels
+            metric_name = item["metric"]["__name__"]
+            labels = {k: v for k, v in item["metric"].items() if k != "__name__"}
+
+            # Extract the values (for range vectors, they're in the 'values' field)
+            values = item.get("values", [])
+
+            if values:
+                timestamps, samples = _parse_samples(values)
+                series.append(_Series(metric_name, labels, timestamps, samples))
+        return series
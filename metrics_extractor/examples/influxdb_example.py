@@ -5,8 +5,9 @@ Simple example of using the Metrics Extractor API with InfluxDB.
 
 from datetime import datetime, timedelta, timezone
 
-import matplotlib.pyplot as plt
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 
 from metrics_extractor import MetricsExtractor, InfluxDBSource, logger, setup_logging
 
@@ -24,6 +25,10 @@ def main():
     influxdb_org = "multipaper"
     influxdb_bucket = "multipaper"
 
+    # Parquet is always written; CSV and JSON copies are opt-in
+    save_csv = False
+    save_json = False
+
     try:
         # Initialize the InfluxDB data source
         logger.info("Creating InfluxDB data source...")
@@ -91,31 +96,47 @@ def main():
                 logger.info("Time range in data: %s to %s", data.index.min(), data.index.max())
                 logger.info("Sample data:")
                 logger.debug("\n%s", data.head())
-                
-                # Save the data to different formats
-                logger.info("Saving %s to different formats...", metric_name)
-
-                # CSV
-                data.to_csv(f"influxdb_metrics_{metric_name}.csv")
-                logger.info("Saved to influxdb_metrics_%s.csv", metric_name)
-
-                # Parquet
-                data.to_parquet(f"influxdb_metrics_{metric_name}.parquet")
-                logger.info("Saved to influxdb_metrics_%s.parquet", metric_name)
-
-                # JSON
-                data.to_json(f"influxdb_metrics_{metric_name}.json", orient="records")
-                logger.info("Saved to influxdb_metrics_%s.json", metric_name)
             else:
                 logger.warning("No data found for metric %s in the specified time range", metric_name)
 
+        # Save all metrics in one write: a Parquet dataset partitioned by metric
+        # instead of one file per metric and format
+        frames = [data for data in metrics_data.values() if not data.empty]
+        if frames:
+            combined = pd.concat(frames).reset_index()
+            combined.to_parquet(
+                "influxdb_metrics.parquet",
+                engine="pyarrow",
+                compression="zstd",
+                partition_cols=["metric"],
+                # Replace the files of the written metrics, as the per-metric files
+                # were overwritten, instead of adding to them on every run
+                existing_data_behavior="delete_matching",
+            )
+            logger.info("Saved to influxdb_metrics.parquet/")
+
+            if save_csv:
+                # Single Arrow CSV writer, no per-row Python work
+                pa_csv.write_csv(
+                    pa.Table.from_pandas(combined, preserve_index=False),
+                    "influxdb_metrics.csv",
+                )
+                logger.info("Saved to influxdb_metrics.csv")
+
+            if save_json:
+                combined.to_json("influxdb_metrics.json", orient="records", date_format="iso")
+                logger.info("Saved to influxdb_metrics.json")
+
         # Check if we have any data to plot
-        has_data = any(not data.empty for data in metrics_data.values())
+        has_data = bool(frames)
         
         # Only proceed with plotting if we have data
         if has_data:
             # Plot the data
             try:
+                # Imported here so runs that do not plot skip the matplotlib import
+                import matplotlib.pyplot as plt
+
                 logger.info("Creating plot...")
                 plt.figure(figsize=(12, 6))
 
@@ -3,15 +3,48 @@
 Simple example of using the Metrics Extractor API.
 """
 
+import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import partial
 
-import matplotlib.pyplot as plt
-import pandas as pd
 import logging
 
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, speeds up writing the JSON files
+    orjson = None
+
 from metrics_extractor import MetricsExtractor, PrometheusSource
 
 
+def write_csv(table, path):
+    """
+    Write an Arrow table to CSV, decoding dictionary (categorical) columns.
+    """
+    columns = [
+        column.cast(column.type.value_type) if pa.types.is_dictionary(column.type) else column
+        for column in table.columns
+    ]
+    pa_csv.write_csv(pa.Table.from_arrays(columns, names=table.column_names), path)
+
+
+def write_json(table, path):
+    """
+    Write an Arrow table to JSON as a list of records.
+    """
+    records = table.to_pylist()
+    with open(path, "wb") as f:
+        if orjson is not None:
+            f.write(orjson.dumps(records, default=str))
+        else:
+            f.write(json.dumps(records, default=str).encode())
+
+
 def main():
     """
     Extract metrics from Prometheus and plot them.
@@ -65,42 +98,51 @@ def main():
         )
 
         # Print the extracted data
-        logger.info("\nExtracted data:")
+        logger.info("Extracted data:")
         logger.info("Number of metrics: %s", len(metrics_data))
         
-        # Process each metric
-        for metric_name, data in metrics_data.items():
-            logger.info("\nMetric: %s", metric_name)
-            logger.info("Shape: %s", data.shape)
-            logger.info("Sample data:")
-            logger.debug("\n%s", data.head())
-
-            # Save each metric to its own file
-            logger.info("Saving %s to different formats...", metric_name)
-
-            # CSV
-            data.to_csv(f"metrics_{metric_name}.csv")
-            logger.info("Saved to metrics_%s.csv", metric_name)
-
-            # Parquet
-            data.to_parquet(f"metrics_{metric_name}.parquet")
-            logger.info("Saved to metrics_%s.parquet", metric_name)
-
-            # JSON
-            data.to_json(f"metrics_{metric_name}.json", orient="records")
-            logger.info("Saved to metrics_%s.json", metric_name)
-
-        # Create a combined DataFrame for plotting all metrics together
-        combined_data = pd.DataFrame()
-        for metric_name, data in metrics_data.items():
-            if combined_data.empty:
-                combined_data = data.copy()
-            else:
-                # Append data, preserving the metric name
-                combined_data = pd.concat([combined_data, data])
+        def save(write, table, path):
+            write(table, path)
+            logger.info("Saved to %s", path)
+
+        write_parquet = partial(pq.write_table, compression="zstd")
+
+        # The files are independent, so they are written concurrently
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = []
+
+            # Process each metric
+            for metric_name, data in metrics_data.items():
+                logger.info("\nMetric: %s", metric_name)
+                logger.info("Shape: %s", data.shape)
+                # Only build the sample when it is actually logged
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Sample data:\n%s", data.head())
+
+                # Save each metric to its own file
+                logger.info("Saving %s to different formats...", metric_name)
+
+                # Convert to Arrow once and write every format from the same table
+                table = pa.Table.from_pandas(data, preserve_index=True)
+
+                # CSV
+                futures.append(executor.submit(save, write_csv, table, f"metrics_{metric_name}.csv"))
+
+                # Parquet
+                futures.append(executor.submit(save, write_parquet, table, f"metrics_{metric_name}.parquet"))
+
+                # JSON
+                futures.append(executor.submit(save, write_json, table, f"metrics_{metric_name}.json"))
+
+            # Re-raise any write error
+            for future in futures:
+                future.result()
 
         # Plot the data
         try:
+            # Imported here so runs that do not plot skip the matplotlib import
+            import matplotlib.pyplot as plt
+
             logger.info("Creating plot...")
             plt.figure(figsize=(12, 6))
 
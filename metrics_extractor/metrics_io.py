@@ -1,15 +1,144 @@
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import numpy as np
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
-def load_metrics(selected_metric, experiment, type_exp):
-    metric_name = selected_metric.split("{")[0]  # Get the base metric name without filters
-    if "master" in selected_metric:
-        metric_name = f"{metric_name}_master"
-    elif "server" in selected_metric:
-        metric_name = f"{metric_name}_server"
-    df = pd.read_csv(f"metrics/{type_exp}/{experiment}/{metric_name}.csv")
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    return df
+# label columns with few distinct values, stored dictionary-encoded in Parquet
+LABEL_COLUMNS = ("server_name", "exported_server_name", "owner", "chunk_owner")
+# other string columns with fewer distinct values than this share of the rows are
+# loaded as categoricals too
+LABEL_CARDINALITY = 0.05
+
+
+def _metric_file_names(selected_metrics):
+    # get the base metric names without filters or functions, and add the suffixes,
+    # for all metrics at once
+    names = pd.Index(selected_metrics, dtype=object)
+    # "master" takes precedence when a metric mentions both
+    suffixes = np.select(
+        [names.str.contains("master", regex=False), names.str.contains("server", regex=False)],
+        ["_master", "_server"],
+        "",
+    )
+    return list(names.str.split("{", n=1).str[0] + suffixes)
+
+
+@lru_cache(maxsize=None)
+def _metric_file_name(selected_metric):
+    # the metric list is fixed per run, so each name is only parsed once
+    return _metric_file_names([selected_metric])[0]
+
+
+def _metric_path(selected_metric, experiment, type_exp):
+    base_path = f"metrics/{type_exp}/{experiment}/{_metric_file_name(selected_metric)}"
+    path = f"{base_path}.parquet"
+    if not os.path.exists(path):
+        # fall back to CSV files saved by older versions
+        path = f"{base_path}.csv"
+    return path
+
+
+def build_path_index(selected_metrics, experiment, type_exp):
+    # resolve the file of every metric once, so loops over many metrics and plots can
+    # pass path= to load_metrics instead of resolving it again on each call
+    return {
+        selected_metric: _metric_path(selected_metric, experiment, type_exp)
+        for selected_metric in selected_metrics
+    }
+
+
+def _freeze(value):
+    # turn filter lists into tuples so they can be part of the cache key
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _read_csv(path, columns, parse_timestamp):
+    # parsing CSV is slow, so a Feather (Arrow IPC) copy is kept next to the file and read
+    # instead while it is newer than the CSV
+    feather_path = f"{os.path.splitext(path)[0]}.feather"
+    if os.path.exists(feather_path) and os.path.getmtime(feather_path) >= os.path.getmtime(path):
+        return pd.read_feather(feather_path, columns=columns)
+    df = pd.read_csv(path)
+    if not parse_timestamp:
+        # keep the timestamps as stored, for callers that do not need datetimes
+        return df[columns] if columns is not None else df
+    # the same timestamp repeats once per label value, so parsed strings are cached
+    df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True, cache=True)
+    try:
+        df.to_feather(feather_path, compression="lz4")
+    except (OSError, TypeError, ValueError, pa.ArrowException):
+        # the Feather copy is only an optimization, keep going without it
+        pass
+    return df[columns] if columns is not None else df
+
+
+@lru_cache(maxsize=128)
+def _load_metrics_cached(path, mtime, columns, filters, parse_timestamp):
+    # mtime is only part of the cache key, so a rewritten file is parsed again
+    columns = list(columns) if columns is not None else None
+    if path.endswith(".parquet"):
+        # Parquet keeps the timestamp dtype, so no datetime parsing is needed, and the
+        # columns and filters are applied while reading
+        df = pd.read_parquet(path, engine="pyarrow", columns=columns, filters=filters)
+    else:
+        df = _read_csv(path, columns, parse_timestamp)
+        if filters:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            df = table.filter(pq.filters_to_expression(filters)).to_pandas()
+    # categorical labels make unique, groupby and equality masks work on integer codes;
+    # besides the known label columns, any other low-cardinality string column is a label
+    conversions = {
+        column: "category" for column in LABEL_COLUMNS
+        if column in df.columns and df[column].dtype != "category"
+    }
+    # pandas 3 stores strings with the string dtype rather than object
+    for column in df.select_dtypes(["object", "string"]).columns:
+        if column != "timestamp" and df[column].nunique() < LABEL_CARDINALITY * len(df):
+            conversions[column] = "category"
+    return df.astype(conversions) if conversions else df
+
+
+def load_metrics(
+    selected_metric, experiment, type_exp, columns=None, filters=None, path=None, parse_timestamp=True
+):
+    # several plot templates load the same metrics in one run, so parsed files are cached
+    # columns: only load these columns, e.g. ["timestamp", "value", "server_name"]
+    # filters: only load the matching rows, in pyarrow filter syntax,
+    #   e.g. [("server_name", "==", "server-1")]
+    # path: the file of the metric, e.g. from build_path_index
+    # parse_timestamp: parse the timestamps of legacy CSV files into datetimes; Parquet
+    #   files always keep their datetime dtype, at no extra cost
+    if path is None:
+        path = _metric_path(selected_metric, experiment, type_exp)
+    columns = tuple(columns) if columns is not None else None
+    # return a shallow copy: callers can add, drop or replace columns without touching
+    # the cache, but must not modify the values in place
+    return _load_metrics_cached(
+        path, os.path.getmtime(path), columns, _freeze(filters), parse_timestamp
+    ).copy(deep=False)
+
+
+# drop all cached metrics, e.g. between experiments to bound memory
+load_metrics.cache_clear = _load_metrics_cached.cache_clear
+
+
+def scan_metrics(selected_metric, experiment, type_exp, path=None):
+    # lazy polars counterpart of load_metrics: nothing is read until the frame is collected,
+    # so polars only reads the columns and rows the query needs
+    try:
+        import polars as pl
+    except ImportError as e:
+        raise ImportError("polars is required to scan metrics lazily") from e
+    if path is None:
+        path = _metric_path(selected_metric, experiment, type_exp)
+    if path.endswith(".parquet"):
+        return pl.scan_parquet(path)
+    return pl.scan_csv(path, try_parse_dates=True)
 
 
 def save_metrics(selected_metrics, from_time, to_time, source, extractor, experiment, type_exp):
@@ -23,15 +152,34 @@ def save_metrics(selected_metrics, from_time, to_time, source, extractor, experi
     # create the directory if it does not exist
     output_dir = f"metrics/{type_exp}/{experiment}"
     os.makedirs(output_dir, exist_ok=True)
-    # save the data to a file
-    for metric_name, data in metrics_data.items():
-        # only get the name of the metric, remove the filter part or the function part
-        base_metric_name = metric_name.split("{")[0]
-        # add a suffix to the metric name
-        suffix = ""
-        if "master" in metric_name:
-            suffix = "_master"
-        elif "server" in metric_name:
-            suffix = "_server"
-
-        data.to_csv(f"metrics/{type_exp}/{experiment}/{base_metric_name}{suffix}.csv")
+    # the files are independent and pandas releases the GIL while serializing and
+    # writing, so they are saved concurrently
+    if metrics_data:
+        paths = [
+            f"{output_dir}/{file_name}.parquet"
+            for file_name in _metric_file_names(list(metrics_data))
+        ]
+        with ThreadPoolExecutor(max_workers=min(8, len(metrics_data))) as executor:
+            list(executor.map(_save_metric, paths, metrics_data.values()))
+
+
+def _save_metric(path, data):
+    # keep the timestamp as a column, as load_metrics callers expect
+    data = data.reset_index()
+    sorting_columns = None
+    # metrics without data have no timestamp column
+    if "timestamp" in data.columns:
+        # store the rows in time order; the stable sort keeps the order of each series'
+        # samples, and the file metadata records the order, so readers can rely on it
+        data = data.sort_values("timestamp", kind="stable", ignore_index=True)
+        sorting_columns = [pq.SortingColumn(data.columns.get_loc("timestamp"))]
+    for column in LABEL_COLUMNS:
+        if column in data.columns:
+            data[column] = data[column].astype("category")
+    data.to_parquet(
+        path,
+        engine="pyarrow",
+        compression="zstd",
+        index=False,
+        sorting_columns=sorting_columns,
+    )
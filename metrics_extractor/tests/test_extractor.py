@@ -5,10 +5,12 @@ Tests for the MetricsExtractor class.
 import unittest
 from datetime import datetime, timedelta
 
+import numpy as np
 import pandas as pd
 
+from metrics_extractor.core.cache import LRUQueryCache
 from metrics_extractor.core.datasource import DataSource
-from metrics_extractor.core.extractor import MetricsExtractor
+from metrics_extractor.core.extractor import MetricsExtractor, _downcast
 
 
 class MockDataSource(DataSource):
@@ -16,14 +18,18 @@ class MockDataSource(DataSource):
 
     def __init__(self):
         self.connect_called = False
+        self.connect_count = 0
+        self.session = None
         self.get_metrics_called = False
         self.get_data_called = False
         self.metrics = None
         self.from_time = None
         self.to_time = None
 
-    def connect(self):
+    def connect(self, session=None):
         self.connect_called = True
+        self.connect_count += 1
+        self.session = session
 
     def get_metrics(self):
         self.get_metrics_called = True
@@ -42,17 +48,14 @@ class MockDataSource(DataSource):
             freq="1min",
         )
 
-        data = {
-            "metric": [],
-            "value": [],
-        }
-
-        for metric in metrics or ["metric1"]:
-            for i in range(len(index)):
-                data["metric"].append(metric)
-                data["value"].append(i)
-
-        df = pd.DataFrame(data, index=index * len(metrics or ["metric1"]))
+        names = metrics or ["metric1"]
+        df = pd.DataFrame(
+            {
+                "metric": np.repeat(np.asarray(names), len(index)),
+                "value": np.tile(np.arange(len(index)), len(names)),
+            },
+            index=index.append([index] * (len(names) - 1)),
+        )
         return df
 
 
@@ -68,6 +71,15 @@ class TestMetricsExtractor(unittest.TestCase):
 
         self.assertTrue(source.connect_called)
 
+    def test_extract_shares_session_with_source(self):
+        """Test that extract passes the pooled session to the data source."""
+        source = MockDataSource()
+        extractor = MetricsExtractor()
+
+        extractor.extract(source=source)
+
+        self.assertIs(source.session, extractor._session)
+
     def test_extract_gets_data_from_source(self):
         """Test that extract gets data from the data source."""
         source = MockDataSource()
@@ -130,37 +142,112 @@ class TestMetricsExtractor(unittest.TestCase):
         )
         self.assertIsInstance(result_json, str)
 
-    def test_handle_gaps(self):
-        """Test that _handle_gaps correctly handles gaps in the data."""
+    def test_extract_parallel_falls_back_to_threads(self):
+        """Test that extract_parallel works for sources without get_data_async."""
+        source = MockDataSource()
         extractor = MetricsExtractor()
 
-        # Create a DataFrame with gaps
-        index = pd.date_range(
-            start=datetime(2023, 1, 1),
-            end=datetime(2023, 1, 2),
-            freq="1h",
+        result = extractor.extract_parallel(
+            source=source,
+            metrics=["metric1", "metric2"],
         )
 
-        data = {
-            "value": [1, None, 3, None, 5],
-        }
+        self.assertEqual(set(result), {"metric1", "metric2"})
+        self.assertIsInstance(result["metric1"], pd.DataFrame)
+
+    def test_extract_parallel_connects_once(self):
+        """Test that extract_parallel connects to the data source only once."""
+        source = MockDataSource()
+        extractor = MetricsExtractor()
+
+        extractor.extract_parallel(
+            source=source,
+            metrics=["metric1", "metric2", "metric3"],
+        )
 
-        df = pd.DataFrame(data, index=index[:5])
+        self.assertEqual(source.connect_count, 1)
 
-        # Test interpolation
-        result_interpolate = extractor._handle_gaps(df, "interpolate")
-        self.assertFalse(result_interpolate["value"].isna().any())
-        self.assertEqual(result_interpolate["value"][1], 2.0)
+    def test_extract_incremental_yields_chunks_in_order(self):
+        """Test that prefetched chunks are yielded in time order."""
+        source = MockDataSource()
+        extractor = MetricsExtractor()
+
+        chunks = list(
+            extractor.extract_incremental(
+                source=source,
+                metrics=["metric1"],
+                from_time=datetime(2023, 1, 1),
+                to_time=datetime(2023, 1, 4),
+                chunk_size=timedelta(days=1),
+                separate_metrics=False,
+                prefetch_chunks=3,
+            )
+        )
+
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(
+            [chunk.index.min() for chunk in chunks],
+            [pd.Timestamp(2023, 1, day) for day in (1, 2, 3)],
+        )
+
+    def test_extract_with_cache_fetches_only_new_tail(self):
+        """Test that a cached window is extended by querying only the new data."""
+        source = MockDataSource()
+        extractor = MetricsExtractor(cache=LRUQueryCache())
+        from_time = datetime(2023, 1, 1)
+
+        extractor.extract(
+            source=source,
+            metrics=["metric1"],
+            from_time=from_time,
+            to_time=datetime(2023, 1, 1, 1),
+        )
+        result = extractor.extract(
+            source=source,
+            metrics=["metric1"],
+            from_time=from_time,
+            to_time=datetime(2023, 1, 1, 2),
+        )
+
+        self.assertEqual(source.from_time, datetime(2023, 1, 1, 1))
+        self.assertEqual(result["metric1"].index.min(), pd.Timestamp(from_time))
+        self.assertEqual(result["metric1"].index.max(), pd.Timestamp(2023, 1, 1, 2))
+        self.assertTrue(result["metric1"].index.is_unique)
+
+    def test_downcast(self):
+        """Test that _downcast shrinks float and repeated string columns."""
+        df = pd.DataFrame(
+            {
+                "metric": ["cpu"] * 4,
+                "value": [1.0, 2.0, 3.0, 4.0],
+                "instance": ["a", "b", "c", "d"],
+            }
+        )
+
+        result = _downcast(df)
+
+        self.assertEqual(result["value"].dtype, "float32")
+        self.assertEqual(result["metric"].dtype, "category")
+        # Every value is distinct, so the column stays as strings
+        self.assertNotEqual(result["instance"].dtype, "category")
+
+    def test_batch_group_data_drops_other_metrics_labels(self):
+        """Test that a metric split from a batch only keeps its own labels."""
+        index = pd.date_range(start=datetime(2023, 1, 1), periods=4, freq="1min")
+        batch = pd.DataFrame(
+            {
+                "metric": pd.Categorical(["cpu", "cpu", "mem", "mem"]),
+                "value": [1.0, 2.0, 3.0, 4.0],
+                "job": pd.Categorical([None, None, "node", "node"]),
+                "__name__": ["cpu", "cpu", "mem", "mem"],
+            },
+            index=index,
+        )
 
-        # Test forward fill
-        result_ffill = extractor._handle_gaps(df, "ffill")
-        self.assertFalse(result_ffill["value"].isna().any())
-        self.assertEqual(result_ffill["value"][1], 1.0)
+        result = MetricsExtractor._batch_group_data(batch[batch["__name__"] == "cpu"])
 
-        # Test backward fill
-        result_bfill = extractor._handle_gaps(df, "bfill")
-        self.assertFalse(result_bfill["value"].isna().any())
-        self.assertEqual(result_bfill["value"][1], 3.0)
+        self.assertEqual(list(result.columns), ["metric", "value"])
+        self.assertEqual(list(result["metric"].cat.categories), ["cpu"])
 
 
 if __name__ == "__main__":
@@ -1,8 +1,12 @@
+import sys
 from dataclasses import dataclass, field
 from typing import Optional, List
 
+# Slotted dataclasses (Python 3.10+) drop the per-instance __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class AxisConfig:
     labels: list[str] = field(default_factory=list)
     ylabel: str = None
@@ -10,7 +14,8 @@ class AxisConfig:
     plot_kwargs: list[dict] = field(default_factory=list)  # List of dicts for each series' styling
 
 
-@dataclass
+# Frozen: templates build it once through default_common and never modify it
+@dataclass(frozen=True, **_SLOTS)
 class CommonPlotConfig:
     title: str
     xlim: tuple[float, float] = None
@@ -27,8 +32,16 @@ class CommonPlotConfig:
     subplots_adjust: dict = None
     time_unit: str = 's'
     output_path: Optional[str] = None
+    # Show the plot after saving it; batch runs that only save plots can disable it, which
+    # also lets plot_df reuse one figure across plots
+    show: bool = True
+    # Series longer than this are decimated before plotting; None plots every sample
+    max_points: Optional[int] = 4000
+    # Realign the secondary y-axis ticks with the primary ones, for plots whose two scales
+    # should line up
+    align_yaxes: bool = False
 
-@dataclass
+@dataclass(**_SLOTS)
 class PlotConfig:
     common: CommonPlotConfig
     primary_axis: AxisConfig
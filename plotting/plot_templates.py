@@ -1,8 +1,109 @@
-from plotting.plot_utils import plot_df
+from plotting.plot_utils import plot_df, split_by, split_by_polars
 from plotting.config import AxisConfig, CommonPlotConfig, PlotConfig
-from metrics_extractor.metrics_io import load_metrics
+from metrics_extractor.metrics_io import build_path_index, load_metrics, scan_metrics
+
+import os
+from dataclasses import replace
+from functools import lru_cache
+from types import MappingProxyType
+
+# Read-only line styles shared by every series of the per-server plots
+_LINE_SOLID = MappingProxyType({"linestyle": "-"})
+_LINE_DASHED = MappingProxyType({"linestyle": "--"})
+
+# Backend used to load and split per-server metrics: 'pandas' (default) or 'polars'
+METRICS_BACKEND = os.environ.get("METRICS_BACKEND", "pandas")
+
+
+# Shared defaults of the plot templates, built once at import
+_BASE_COMMON = CommonPlotConfig(
+    title="",
+    figsize=(15, 6),
+    show_legend=True,
+    # read-only, since every config built from the base shares it
+    legend_kwargs=MappingProxyType({"loc": "upper left"}),
+    tight_layout=True,
+    grid=True,
+    grid_minor=False,
+    minor_ticks=False,
+    # grid_kwargs={"linestyle": "-"},
+    # minor_grid_kwargs={"linestyle": ":"},
+    time_unit='s',
+)
+
+
+def default_common(title, output_path, **overrides):
+    """
+    Build the CommonPlotConfig shared by the plot templates.
+    :param title: The title of the plot.
+    :param output_path: The path of the output PDF.
+    :param overrides: CommonPlotConfig fields that differ from the shared defaults.
+    :return: The plot configuration.
+    """
+    # PLOT_SHOW is read on each call rather than at import, since report workers set it
+    # after the module may already have been imported
+    overrides.setdefault("show", os.environ.get("PLOT_SHOW", "1") != "0")
+    return replace(_BASE_COMMON, title=title, output_path=output_path, **overrides)
+
+
+def chunks_master_data(selected_metric, experiment, type_exp):
+    """
+    Load the owned chunks per server and the max-min difference between servers.
+    Shared by owned_chunks_master_plot and max_diff_chunks_master_plot, so a report
+    running both loads and splits the metric once.
+    :param selected_metric: The owned chunks metric (veloctiy_server_chunks).
+    :param experiment: The name of the experiment.
+    :param type_exp: Type of experiment ('exp_vanilla' or 'exp_mod').
+    :return: The servers, the DataFrame of each server and the difference DataFrame.
+    """
+    path = build_path_index([selected_metric], experiment, type_exp)[selected_metric]
+    # The file modification time is part of the key, so a rewritten file is loaded again
+    return _chunks_master_data(selected_metric, experiment, type_exp, path, os.path.getmtime(path))
+
+
+@lru_cache(maxsize=16)
+def _chunks_master_data(selected_metric, experiment, type_exp, path, mtime):
+    chunks = load_metrics(selected_metric, experiment, type_exp, columns=["timestamp", "value", "exported_server_name"], path=path)
+
+    # Create a DataFrame for each server's chunks
+    servers, dfs_by_server = split_by(chunks, "exported_server_name")
+
+    # Calcular el màxim i el mínim de la diferència del nombre de chunks entre servers
+    # Servers are scraped at the same timestamps, so the extremes of each timestamp are
+    # taken directly on the long-form data, without a wide per-server table
+    by_time = chunks.groupby("timestamp", sort=True)["value"]
+    # Calculate max-min difference
+    diff_df = (by_time.max() - by_time.min()).abs().rename("value").reset_index()
+    return servers, dfs_by_server, diff_df
+
+
+def str_labels(labels):
+    """
+    Convert a label column to strings, keeping missing values missing.
+    Categorical columns only convert their categories, not every row.
+    :param labels: The label column (e.g. 'exported_server_name').
+    :return: The labels as strings, categorical if the column was.
+    """
+    if labels.dtype == "category":
+        categories = labels.cat.categories.astype(str)
+        # Keep split_by's order the one of the sorted string labels
+        return labels.cat.rename_categories(categories).cat.reorder_categories(sorted(categories))
+    return labels.astype(str).where(labels.notna())
 
-import pandas as pd
+
+def load_split_metrics(selected_metric, experiment, type_exp, col):
+    """
+    Load a metric and split it into one timestamp/value DataFrame per value of a label column.
+    :param selected_metric: The metric to load.
+    :param experiment: The name of the experiment.
+    :param type_exp: Type of experiment ('exp_vanilla' or 'exp_mod').
+    :param col: The label column to split by (e.g. 'server_name').
+    :return: The sorted label values and the DataFrame of each value.
+    """
+    if METRICS_BACKEND == "polars":
+        return split_by_polars(scan_metrics(selected_metric, experiment, type_exp), col)
+    data = load_metrics(selected_metric, experiment, type_exp, columns=["timestamp", "value", col])
+    return split_by(data, col)
 
 def tps_players_plot(experiment, selected_metrics, type_exp):
     """
@@ -12,10 +113,10 @@ def tps_players_plot(experiment, selected_metrics, type_exp):
     :param type_exp: Type of experiment ('exp_vanilla' or 'exp_mod').
     """
 
-    median_tps = load_metrics(selected_metrics[2], experiment, type_exp)
-    quantile_95_tps = load_metrics(selected_metrics[3], experiment, type_exp)
-    total_players = load_metrics(selected_metrics[4], experiment, type_exp)
-    average_tps = load_metrics(selected_metrics[25], experiment, type_exp)
+    median_tps = load_metrics(selected_metrics[2], experiment, type_exp, columns=["timestamp", "value"])
+    quantile_95_tps = load_metrics(selected_metrics[3], experiment, type_exp, columns=["timestamp", "value"])
+    total_players = load_metrics(selected_metrics[4], experiment, type_exp, columns=["timestamp", "value"])
+    average_tps = load_metrics(selected_metrics[25], experiment, type_exp, columns=["timestamp", "value"])
 
     primary_axis = AxisConfig(
         labels=["Median TPS", "95th Percentile TPS", "Average TPS"],
@@ -38,19 +139,10 @@ def tps_players_plot(experiment, selected_metrics, type_exp):
     )
 
 
-    common_conf = CommonPlotConfig(
-        title="TPS and Players",
-        figsize=(15, 6),
-        show_legend=True,
-        legend_kwargs={"loc": "upper left"},
-        tight_layout=True,
-        grid=True,
-        grid_minor=False,
-        minor_ticks=False,
-        # grid_kwargs={"linestyle": "-"},
-        # minor_grid_kwargs={"linestyle": ":"},
-        time_unit='s',
-        output_path=f"plots/{type_exp}/{experiment}/tps_players_{experiment}.pdf"
+    common_conf = default_common(
+        "TPS and Players",
+        f"plots/{type_exp}/{experiment}/tps_players_{experiment}.pdf",
+        align_yaxes=True,
     )
 
     conf = PlotConfig(
@@ -77,13 +169,7 @@ def mspt_plot(experiment, selected_metrics, type_exp):
     :param type_exp: Type of experiment ('exp_vanilla' or 'exp_mod').
     """
     
-    mstp_data = load_metrics(selected_metrics[6], experiment, type_exp) # mc_mspt_seconds_10_mean
-
-    servers = sorted(mstp_data["server_name"].unique())
-    dfs_by_server = [
-        mstp_data[mstp_data["server_name"] == server][["timestamp", "value"]].reset_index(drop=True)
-        for server in servers
-    ]
+    servers, dfs_by_server = load_split_metrics(selected_metrics[6], experiment, type_exp, "server_name") # mc_mspt_seconds_10_mean
 
     primary_axis = AxisConfig(
         labels=[f"MSPT Server {i+1}" for i in range(len(servers))],
@@ -97,19 +183,9 @@ def mspt_plot(experiment, selected_metrics, type_exp):
 
     )
 
-    common_conf = CommonPlotConfig(
-        title="MSPT per Server",
-        figsize=(15, 6),
-        show_legend=True,
-        legend_kwargs={"loc": "upper left"},
-        tight_layout=True,
-        grid=True,
-        grid_minor=False,
-        minor_ticks=False,
-        # grid_kwargs={"linestyle": "-"},
-        # minor_grid_kwargs={"linestyle": ":"},
-        time_unit='s',
-        output_path=f"plots/{type_exp}/{experiment}/mspt_{experiment}.pdf"
+    common_conf = default_common(
+        "MSPT per Server",
+        f"plots/{type_exp}/{experiment}/mspt_{experiment}.pdf",
     )
 
     conf = PlotConfig(
@@ -129,9 +205,9 @@ def mspt_stats_plot(experiment, selected_metrics, type_exp):
     :param type_exp: Type of experiment ('exp_vanilla' or 'exp_mod').
     """
 
-    avg_mspt = load_metrics(selected_metrics[26], experiment, type_exp) # avg(mc_mspt_seconds_10_mean)
-    quantile_95_mspt = load_metrics(selected_metrics[27], experiment, type_exp) # quantile(0.95, mc_mspt_seconds_10_mean)
-    median_mspt = load_metrics(selected_metrics[28], experiment, type_exp) # quantile(0.5, mc_mspt_seconds_10_mean)
+    avg_mspt = load_metrics(selected_metrics[26], experiment, type_exp, columns=["timestamp", "value"]) # avg(mc_mspt_seconds_10_mean)
+    quantile_95_mspt = load_metrics(selected_metrics[27], experiment, type_exp, columns=["timestamp", "value"]) # quantile(0.95, mc_mspt_seconds_10_mean)
+    median_mspt = load_metrics(selected_metrics[28], experiment, type_exp, columns=["timestamp", "value"]) # quantile(0.5, mc_mspt_seconds_10_mean)
 
     primary_axis = AxisConfig(
         labels=["Median MSPT", "95th Percentile MSPT", "Average MSPT"],
@@ -152,19 +228,9 @@ def mspt_stats_plot(experiment, selected_metrics, type_exp):
     # )
 
 
-    common_conf = CommonPlotConfig(
-        title="MSPT (Average, Median, 95th Percentile)",
-        figsize=(15, 6),
-        show_legend=True,
-        legend_kwargs={"loc": "upper left"},
-        tight_layout=True,
-        grid=True,
-        grid_minor=False,
-        minor_ticks=False,
-        # grid_kwargs={"linestyle": "-"},
-        # minor_grid_kwargs={"linestyle": ":"},
-        time_unit='s',
-        output_path=f"plots/{type_exp}/{experiment}/mspt_stats_{experiment}.pdf"
+    common_conf = default_common(
+        "MSPT (Average, Median, 95th Percentile)",
+        f"plots/{type_exp}/{experiment}/mspt_stats_{experiment}.pdf",
     )
 
     conf = PlotConfig(
@@ -191,55 +257,38 @@ def player_tps_server_plot(experiment, selected_metrics, type_exp):
     :param type_exp: Type of experiment ('exp_vanilla' or 'exp_mod').
     """
 
-    players_server = load_metrics(selected_metrics[0], experiment, type_exp) # mc_players_online_local
-    server_tps = load_metrics(selected_metrics[1], experiment, type_exp) # mc_tps
+    players_server = load_metrics(selected_metrics[0], experiment, type_exp, columns=["timestamp", "value", "server_name"]) # mc_players_online_local
 
-    # Filter the players_server DataFrame to only include the relevant columns
-    servers = sorted(players_server["server_name"].unique())
-    # Create a DataFrame for each server's players
-    dfs_by_server = [
-        players_server[players_server["server_name"] == server][["timestamp", "value"]].reset_index(drop=True)
-        for server in servers
-    ]
+    # Create a DataFrame for each server's players
+    servers, dfs_by_server = split_by(players_server, "server_name")
 
-    tps_server = server_tps[server_tps["server_name"].isin(servers)]
-    # Create a DataFrame for each server's TPS
-    dfs_by_server_tps = [
-        tps_server[tps_server["server_name"] == server][["timestamp", "value"]].reset_index(drop=True)
-        for server in servers
-    ]
+    # Only read the TPS of the servers with player data
+    server_tps = load_metrics(
+        selected_metrics[1], experiment, type_exp, # mc_tps
+        columns=["timestamp", "value", "server_name"],
+        filters=[("server_name", "in", list(servers))],
+    )
+
+    # Create a DataFrame for each server's TPS, for the same servers
+    _, dfs_by_server_tps = split_by(server_tps, "server_name", keys=servers)
 
     primary_axis = AxisConfig(
         labels=[f"TPS Server {i+1}" for i in range(len(servers))],
         ylabel="TPS",
         ylim=(0, 20),
-        plot_kwargs=[
-            {"linestyle": "--"} for _ in servers
-        ]
+        plot_kwargs=[_LINE_DASHED] * len(servers)
     )
 
     secondary_axis = AxisConfig(
         labels=[f"Players Server {i+1}" for i in range(len(servers))],
         ylabel="Active Players",
         ylim=(0, None),
-        plot_kwargs=[
-            {"linestyle": "-"} for _ in servers
-        ]
+        plot_kwargs=[_LINE_SOLID] * len(servers)
     )
 
-    common_conf = CommonPlotConfig(
-        title="Active Players and TPS per Server",
-        figsize=(15, 6),
-        show_legend=True,
-        legend_kwargs={"loc": "upper left"},
-        tight_layout=True,
-        grid=True,
-        grid_minor=False,
-        minor_ticks=False,
-        # grid_kwargs={"linestyle": "-"},
-        # minor_grid_kwargs={"linestyle": ":"},
-        time_unit='s',
-        output_path=f"plots/{type_exp}/{experiment}/player_tps_server_{experiment}.pdf"
+    common_conf = default_common(
+        "Active Players and TPS per Server",
+        f"plots/{type_exp}/{experiment}/player_tps_server_{experiment}.pdf",
     )
 
     conf = PlotConfig(
@@ -261,37 +310,21 @@ def players_servers_plot(experiment, selected_metrics, type_exp):
     :param type_exp: Type of experiment ('exp_vanilla' or 'exp_mod').
     """
 
-    players_server = load_metrics(selected_metrics[0], experiment, type_exp) # mc_players_online_local
+    players_server = load_metrics(selected_metrics[0], experiment, type_exp, columns=["timestamp", "value", "server_name"]) # mc_players_online_local
 
     # Filter the players_server DataFrame to only include the relevant columns
-    servers = sorted(players_server["server_name"].unique())
     # Create a DataFrame for each server's players
-    dfs_by_server = [
-        players_server[players_server["server_name"] == server][["timestamp", "value"]].reset_index(drop=True)
-        for server in servers
-    ]
+    servers, dfs_by_server = split_by(players_server, "server_name")
 
     primary_axis = AxisConfig(
         labels=[f"Players Server {i+1}" for i in range(len(servers))],
         ylabel="Active Players",
-        plot_kwargs=[
-            {"linestyle": "-"} for _ in servers
-        ]
+        plot_kwargs=[_LINE_SOLID] * len(servers)
     )
 
-    common_conf = CommonPlotConfig(
-        title="Active Players per Server",
-        figsize=(15, 6),
-        show_legend=True,
-        legend_kwargs={"loc": "upper left"},
-        tight_layout=True,
-        grid=True,
-        grid_minor=False,
-        minor_ticks=False,
-        # grid_kwargs={"linestyle": "-"},
-        # minor_grid_kwargs={"linestyle": ":"},
-        time_unit='s',
-        output_path=f"plots/{type_exp}/{experiment}/players_server_{experiment}.pdf"
+    common_conf = default_common(
+        "Active Players per Server",
+        f"plots/{type_exp}/{experiment}/players_server_{experiment}.pdf",
     )
 
     conf = PlotConfig(
@@ -311,38 +344,20 @@ def tps_servers_plot(experiment, selected_metrics, type_exp):
     :param type_exp: Type of experiment ('exp_vanilla' or 'exp_mod').
     """
 
-    server_tps = load_metrics(selected_metrics[1], experiment, type_exp) # mc_tps
-
-    servers = sorted(server_tps["server_name"].unique())
     # Create a DataFrame for each server's TPS
-    dfs_by_server_tps = [
-        server_tps[server_tps["server_name"] == server][["timestamp", "value"]].reset_index(drop=True)
-        for server in servers
-    ]
+    servers, dfs_by_server_tps = load_split_metrics(selected_metrics[1], experiment, type_exp, "server_name") # mc_tps
 
 
     primary_axis = AxisConfig(
         labels=[f"TPS Server {i+1}" for i in range(len(servers))],
         ylabel="TPS",
         ylim=(0, 20),
-        plot_kwargs=[
-            {"linestyle": "-"} for _ in servers
-        ]
+        plot_kwargs=[_LINE_SOLID] * len(servers)
     )
 
-    common_conf = CommonPlotConfig(
-        title="TPS per Server",
-        figsize=(15, 6),
-        show_legend=True,
-        legend_kwargs={"loc": "upper left"},
-        tight_layout=True,
-        grid=True,
-        grid_minor=False,
-        minor_ticks=False,
-        # grid_kwargs={"linestyle": "-"},
-        # minor_grid_kwargs={"linestyle": ":"},
-        time_unit='s',
-        output_path=f"plots/{type_exp}/{experiment}/tps_server_{experiment}.pdf"
+    common_conf = default_common(
+        "TPS per Server",
+        f"plots/{type_exp}/{experiment}/tps_server_{experiment}.pdf",
     )
 
     conf = PlotConfig(
@@ -362,34 +377,19 @@ def chunk_ownership_plot(experiment, selected_metrics, type_exp):
     :param type_exp: Type of experiment ('exp_vanilla' or 'exp_mod').
     """
 
-    chunk_ownership_by_owner = load_metrics(selected_metrics[15], experiment, type_exp)  # sum by(owner) (mc_chunk_ownership)
-
-    servers = sorted(chunk_ownership_by_owner["owner"].unique())
     # Create a DataFrame for each server's players
-    dfs_by_server = [
-        chunk_ownership_by_owner[chunk_ownership_by_owner["owner"] == server][["timestamp", "value"]].reset_index(drop=True)
-        for server in servers
-    ]
+    servers, dfs_by_server = load_split_metrics(selected_metrics[15], experiment, type_exp, "owner")  # sum by(owner) (mc_chunk_ownership)
 
     primary_axis = AxisConfig(
         labels=[f"Chunks Server {i+1}" for i in range(len(servers))],
         ylabel="Chunks Owned",
-        plot_kwargs=[
-            {"linestyle": "-"} for _ in servers
-        ]
+        plot_kwargs=[_LINE_SOLID] * len(servers)
     )
 
-    common_conf = CommonPlotConfig(
-        title="Chunk Ownership by Server",
-        figsize=(15, 6),
-        show_legend=True,
+    common_conf = default_common(
+        "Chunk Ownership by Server",
+        f"plots/{type_exp}/{experiment}/chunk_ownership_{experiment}.pdf",
         legend_kwargs={"loc": "best"},
-        tight_layout=True,
-        grid=True,
-        grid_minor=False,
-        minor_ticks=False,
-        time_unit='s',
-        output_path=f"plots/{type_exp}/{experiment}/chunk_ownership_{experiment}.pdf"
     )
 
     conf = PlotConfig(
@@ -409,34 +409,22 @@ def players_chunks_owner_plot(experiment, selected_metrics, type_exp):
     :param type_exp: Type of experiment ('exp_vanilla' or 'exp_mod').
     """
     
-    players_chunks = load_metrics(selected_metrics[18], experiment, type_exp) # sum by(chunk_owner) (mc_player_location)
+    players_chunks = load_metrics(selected_metrics[18], experiment, type_exp, columns=["timestamp", "value", "chunk_owner"]) # sum by(chunk_owner) (mc_player_location)
 
-    servers = sorted(players_chunks["chunk_owner"].dropna().astype(str).unique())
     # Create a DataFrame for each server's players
-    dfs_by_server = [
-        players_chunks[players_chunks["chunk_owner"] == server][["timestamp", "value"]].reset_index(drop=True)
-        for server in servers
-    ]
+    players_chunks["chunk_owner"] = str_labels(players_chunks["chunk_owner"])
+    servers, dfs_by_server = split_by(players_chunks, "chunk_owner")
 
     primary_axis = AxisConfig(
         labels=[f"Chunks Server {i+1}" for i in range(len(servers))],
         ylabel="Num Players",
-        plot_kwargs=[
-            {"linestyle": "-"} for _ in servers
-        ]
+        plot_kwargs=[_LINE_SOLID] * len(servers)
     )
 
-    common_conf = CommonPlotConfig(
-        title="Nº Players in Chunks owned by Server",
-        figsize=(15, 6),
-        show_legend=True,
+    common_conf = default_common(
+        "Nº Players in Chunks owned by Server",
+        f"plots/{type_exp}/{experiment}/num_players_chunk{experiment}.pdf",
         legend_kwargs={"loc": "best"},
-        tight_layout=True,
-        grid=True,
-        grid_minor=False,
-        minor_ticks=False,
-        time_unit='s',
-        output_path=f"plots/{type_exp}/{experiment}/num_players_chunk{experiment}.pdf"
     )
 
     conf = PlotConfig(
@@ -454,35 +442,22 @@ def quality_master_plot(experiment, selected_metrics, type_exp, band):
     :param type_exp: Type of experiment ('exp_vanilla' or 'exp_mod').
     """
     
-    quality = load_metrics(selected_metrics[32], experiment, type_exp) # (veloctiy_server_quality)
-
-    servers = sorted(quality["exported_server_name"].dropna().astype(str).unique())
+    quality = load_metrics(selected_metrics[32], experiment, type_exp, columns=["timestamp", "value", "exported_server_name"]) # (veloctiy_server_quality)
 
-    dfs_by_server = [
-        quality[quality["exported_server_name"] == server][["timestamp", "value"]].reset_index(drop=True)
-        for server in servers
-    ]
+    quality["exported_server_name"] = str_labels(quality["exported_server_name"])
+    servers, dfs_by_server = split_by(quality, "exported_server_name")
 
     primary_axis = AxisConfig(
         labels=[f"Server {i+1}" for i in range(len(servers))],
         ylabel="Quality",
-        plot_kwargs=[
-            {"linestyle": "-"} for _ in servers
-        ]
+        plot_kwargs=[_LINE_SOLID] * len(servers)
     )
 
-    common_conf = CommonPlotConfig(
-        title="Quality ratio by Server",
-        figsize=(15, 6),
-        show_legend=True,
+    common_conf = default_common(
+        "Quality ratio by Server",
+        f"plots/{type_exp}/{experiment}/quality_{experiment}.pdf",
         legend_kwargs={"loc": "best"},
-        tight_layout=True,
-        grid=True,
-        grid_minor=False,
-        minor_ticks=False,
-        band = band,
-        time_unit='s',
-        output_path=f"plots/{type_exp}/{experiment}/quality_{experiment}.pdf"
+        band=band,
     )
 
     conf = PlotConfig(
@@ -500,34 +475,21 @@ def players_master_plot(experiment, selected_metrics, type_exp):
     :param type_exp: Type of experiment ('exp_vanilla' or 'exp_mod').
     """
     
-    players = load_metrics(selected_metrics[31], experiment, type_exp) # (veloctiy_server_players)
+    players = load_metrics(selected_metrics[31], experiment, type_exp, columns=["timestamp", "value", "exported_server_name"]) # (veloctiy_server_players)
 
-    servers = sorted(players["exported_server_name"].dropna().astype(str).unique())
-
-    dfs_by_server = [
-        players[players["exported_server_name"] == server][["timestamp", "value"]].reset_index(drop=True)
-        for server in servers
-    ]
+    players["exported_server_name"] = str_labels(players["exported_server_name"])
+    servers, dfs_by_server = split_by(players, "exported_server_name")
 
     primary_axis = AxisConfig(
         labels=[f"Server {i+1}" for i in range(len(servers))],
         ylabel="Players",
-        plot_kwargs=[
-            {"linestyle": "-"} for _ in servers
-        ]
+        plot_kwargs=[_LINE_SOLID] * len(servers)
     )
 
-    common_conf = CommonPlotConfig(
-        title="Num. players by Server",
-        figsize=(15, 6),
-        show_legend=True,
+    common_conf = default_common(
+        "Num. players by Server",
+        f"plots/{type_exp}/{experiment}/players_{experiment}.pdf",
         legend_kwargs={"loc": "best"},
-        tight_layout=True,
-        grid=True,
-        grid_minor=False,
-        minor_ticks=False,
-        time_unit='s',
-        output_path=f"plots/{type_exp}/{experiment}/players_{experiment}.pdf"
     )
 
     conf = PlotConfig(
@@ -545,34 +507,21 @@ def mspt_master_plot(experiment, selected_metrics, type_exp):
     :param type_exp: Type of experiment ('exp_vanilla' or 'exp_mod').
     """
     
-    mspt = load_metrics(selected_metrics[30], experiment, type_exp) # (veloctiy_server_players)
-
-    servers = sorted(mspt["exported_server_name"].dropna().astype(str).unique())
+    mspt = load_metrics(selected_metrics[30], experiment, type_exp, columns=["timestamp", "value", "exported_server_name"]) # (veloctiy_server_players)
 
-    dfs_by_server = [
-        mspt[mspt["exported_server_name"] == server][["timestamp", "value"]].reset_index(drop=True)
-        for server in servers
-    ]
+    mspt["exported_server_name"] = str_labels(mspt["exported_server_name"])
+    servers, dfs_by_server = split_by(mspt, "exported_server_name")
 
     primary_axis = AxisConfig(
         labels=[f"Server {i+1}" for i in range(len(servers))],
         ylabel="MSPT",
-        plot_kwargs=[
-            {"linestyle": "-"} for _ in servers
-        ]
+        plot_kwargs=[_LINE_SOLID] * len(servers)
     )
 
-    common_conf = CommonPlotConfig(
-        title="MSPT by Server",
-        figsize=(15, 6),
-        show_legend=True,
+    common_conf = default_common(
+        "MSPT by Server",
+        f"plots/{type_exp}/{experiment}/mspt_master_{experiment}.pdf",
         legend_kwargs={"loc": "best"},
-        tight_layout=True,
-        grid=True,
-        grid_minor=False,
-        minor_ticks=False,
-        time_unit='s',
-        output_path=f"plots/{type_exp}/{experiment}/mspt_{experiment}.pdf"
     )
 
     conf = PlotConfig(
@@ -590,8 +539,8 @@ def mspt_tps_master_plot(experiment, selected_metrics, type_exp):
     :param type_exp: Type of experiment ('exp_vanilla' or 'exp_mod').
     """
 
-    mspt = load_metrics(selected_metrics[30], experiment, type_exp) # (veloctiy_server_players)
-    average_tps = load_metrics(selected_metrics[25], experiment, type_exp)
+    mspt = load_metrics(selected_metrics[30], experiment, type_exp, columns=["timestamp", "value", "exported_server_name"]) # (veloctiy_server_players)
+    average_tps = load_metrics(selected_metrics[25], experiment, type_exp, columns=["timestamp", "value"])
 
     # primary_axis = AxisConfig(
     #     labels=["MSPT"],
@@ -602,18 +551,13 @@ def mspt_tps_master_plot(experiment, selected_metrics, type_exp):
     #     ]
     # )
 
-    servers = sorted(mspt["exported_server_name"].dropna().astype(str).unique())
-    dfs_by_server = [
-        mspt[mspt["exported_server_name"] == server][["timestamp", "value"]].reset_index(drop=True)
-        for server in servers
-    ]
+    mspt["exported_server_name"] = str_labels(mspt["exported_server_name"])
+    servers, dfs_by_server = split_by(mspt, "exported_server_name")
 
     primary_axis = AxisConfig(
         labels=[f"Server {i+1}" for i in range(len(servers))],
         ylabel="MSPT",
-        plot_kwargs=[
-            {"linestyle": "-"} for _ in servers
-        ]
+        plot_kwargs=[_LINE_SOLID] * len(servers)
     )
 
     secondary_axis = AxisConfig(
@@ -625,19 +569,9 @@ def mspt_tps_master_plot(experiment, selected_metrics, type_exp):
         ]
     )
 
-    common_conf = CommonPlotConfig(
-        title="MSPT and avg TPS",
-        figsize=(15, 6),
-        show_legend=True,
-        legend_kwargs={"loc": "upper left"},
-        tight_layout=True,
-        grid=True,
-        grid_minor=False,
-        minor_ticks=False,
-        # grid_kwargs={"linestyle": "-"},
-        # minor_grid_kwargs={"linestyle": ":"},
-        time_unit='s',
-        output_path=f"plots/{type_exp}/{experiment}/mspt_tps_{experiment}.pdf"
+    common_conf = default_common(
+        "MSPT and avg TPS",
+        f"plots/{type_exp}/{experiment}/mspt_tps_{experiment}.pdf",
     )
 
     conf = PlotConfig(
@@ -659,24 +593,7 @@ def owned_chunks_master_plot(experiment, selected_metrics, type_exp):
     :param type_exp: Type of experiment ('exp_vanilla' or 'exp_mod').
     """
 
-    chunks = load_metrics(selected_metrics[29], experiment, type_exp) # (veloctiy_server_chunks)
-
-    servers = sorted(chunks["exported_server_name"].unique())
-    # Create a DataFrame for each server's players
-    dfs_by_server = [
-        chunks[chunks["exported_server_name"] == server][["timestamp", "value"]].reset_index(drop=True)
-        for server in servers
-    ]
-
-    # Calcular el màxim i el mínim de la diferència del nombre de chunks entre servers
-    combined_df = pd.concat(
-        [df.set_index("timestamp")["value"].rename(f"server_{i+1}") for i, df in enumerate(dfs_by_server)],
-        axis=1
-    )
-    # Calculate max-min difference
-    max_min_diff = abs(combined_df.max(axis=1) - combined_df.min(axis=1))
-    # Create a DataFrame for the difference
-    diff_df = pd.DataFrame({"timestamp": max_min_diff.index, "value": max_min_diff.values}).reset_index(drop=True)
+    servers, dfs_by_server, diff_df = chunks_master_data(selected_metrics[29], experiment, type_exp) # (veloctiy_server_chunks)
 
     # Cal ajustar els zeros de les escales del gràfic al mateix nivell
     primary_max = max(df["value"].max() for df in dfs_by_server)
@@ -692,9 +609,7 @@ def owned_chunks_master_plot(experiment, selected_metrics, type_exp):
         labels=[f"Chunks Server {i+1}" for i in range(len(servers))],
         ylabel="Chunks Owned",
         ylim = primary_ylim,
-        plot_kwargs=[
-            {"linestyle": "-"} for _ in servers
-        ]
+        plot_kwargs=[_LINE_SOLID] * len(servers)
     )
 
     secondary_axis = AxisConfig(
@@ -706,17 +621,11 @@ def owned_chunks_master_plot(experiment, selected_metrics, type_exp):
         ]
     )
 
-    common_conf = CommonPlotConfig(
-        title="Owned Chunks by Server",
-        figsize=(15, 6),
-        show_legend=True,
+    common_conf = default_common(
+        "Owned Chunks by Server",
+        f"plots/{type_exp}/{experiment}/chunk_ownership_master_{experiment}.pdf",
         legend_kwargs={"loc": "best"},
-        tight_layout=True,
-        grid=True,
-        grid_minor=False,
-        minor_ticks=False,
-        time_unit='s',
-        output_path=f"plots/{type_exp}/{experiment}/chunk_ownership_{experiment}.pdf"
+        align_yaxes=True,
     )
 
     conf = PlotConfig(
@@ -735,24 +644,7 @@ def max_diff_chunks_master_plot(experiment, selected_metrics, type_exp):
     :param type_exp: Type of experiment ('exp_vanilla' or 'exp_mod').
     """
 
-    chunks = load_metrics(selected_metrics[29], experiment, type_exp) # (veloctiy_server_chunks)
-
-    servers = sorted(chunks["exported_server_name"].unique())
-    # Create a DataFrame for each server's players
-    dfs_by_server = [
-        chunks[chunks["exported_server_name"] == server][["timestamp", "value"]].reset_index(drop=True)
-        for server in servers
-    ]
-
-    # Calcular el màxim i el mínim de la diferència del nombre de chunks entre servers
-    combined_df = pd.concat(
-        [df.set_index("timestamp")["value"].rename(f"server_{i+1}") for i, df in enumerate(dfs_by_server)],
-        axis=1
-    )
-    # Calculate max-min difference
-    max_min_diff = abs(combined_df.max(axis=1) - combined_df.min(axis=1))
-    # Create a DataFrame for the difference
-    diff_df = pd.DataFrame({"timestamp": max_min_diff.index, "value": max_min_diff.values}).reset_index(drop=True)
+    servers, dfs_by_server, diff_df = chunks_master_data(selected_metrics[29], experiment, type_exp) # (veloctiy_server_chunks)
 
     primary_axis = AxisConfig(
         labels=[f"Chunks Server {i+1}" for i in range(len(servers))],
@@ -762,17 +654,10 @@ def max_diff_chunks_master_plot(experiment, selected_metrics, type_exp):
         ]
     )
 
-    common_conf = CommonPlotConfig(
-        title="Max. difference of owned chunks by server",
-        figsize=(15, 6),
-        show_legend=True,
+    common_conf = default_common(
+        "Max. difference of owned chunks by server",
+        f"plots/{type_exp}/{experiment}/chunk_diff_{experiment}.pdf",
         legend_kwargs={"loc": "best"},
-        tight_layout=True,
-        grid=True,
-        grid_minor=False,
-        minor_ticks=False,
-        time_unit='s',
-        output_path=f"plots/{type_exp}/{experiment}/chunk_diff_{experiment}.pdf"
     )
 
     conf = PlotConfig(
@@ -3,7 +3,96 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import os
 from typing import Optional, List
+from matplotlib.collections import LineCollection
 from plotting.config import PlotConfig, AxisConfig, CommonPlotConfig
+from plotting.style_setup import strip_spines
+
+# Plots with at least this many series, styled only by the options in COLLECTION_STYLES,
+# are drawn as one LineCollection instead of one Line2D per series
+COLLECTION_MIN_SERIES = 5
+COLLECTION_STYLES = {"color", "linestyle"}
+
+# Reused (figure, axes, twin axes) per figure size, for plots that are saved but not shown
+_FIGURE_POOL = {}
+
+
+def _timestamps(df: pd.DataFrame) -> np.ndarray:
+    # Timestamps as int64 nanoseconds since the epoch (UTC for timezone-aware columns)
+    return df['timestamp'].to_numpy(dtype='datetime64[ns]').view('i8')
+
+
+def _seconds_since(df: pd.DataFrame, start: int) -> np.ndarray:
+    # Seconds elapsed since start (in nanoseconds), computed locally so the caller's
+    # frame is not modified
+    return (_timestamps(df) - start) / 1e9
+
+
+def _series_arrays(df: pd.DataFrame, min_time: int, max_points: Optional[int]):
+    # Elapsed seconds and values of a series, decimated by a constant stride to at most
+    # about max_points samples: denser series collapse to sub-pixel detail anyway
+    t = _seconds_since(df, min_time)
+    v = df['value'].to_numpy(dtype=float)
+    if max_points and len(t) > max_points:
+        stride = len(t) // max_points
+        t, v = t[::stride], v[::stride]
+    return t, v
+
+
+def _plot_series(
+    ax, dfs: List[pd.DataFrame], axis: AxisConfig, min_time: int, max_points: Optional[int]
+):
+    # Styling options and label of each time series
+    styles = [axis.plot_kwargs[i] if i < len(axis.plot_kwargs) else {} for i in range(len(dfs))]
+    labels = [axis.labels[i] if axis.labels else None for i in range(len(dfs))]
+
+    if len(dfs) < COLLECTION_MIN_SERIES or any(set(style) - COLLECTION_STYLES for style in styles):
+        for df, style, label in zip(dfs, styles, labels):
+            t, v = _series_arrays(df, min_time, max_points)
+            ax.plot(t, v, label=label, **style)
+        return
+
+    # Many series styled only by color and line style: draw them as a single artist
+    cycle = plt.rcParams['axes.prop_cycle'].by_key().get('color', ['C0'])
+    colors = [style.get('color', cycle[i % len(cycle)]) for i, style in enumerate(styles)]
+    linestyles = [style.get('linestyle', plt.rcParams['lines.linestyle']) for style in styles]
+    segments = [np.column_stack(_series_arrays(df, min_time, max_points)) for df in dfs]
+    collection = LineCollection(
+        segments, colors=colors, linestyles=linestyles, linewidths=plt.rcParams['lines.linewidth']
+    )
+    ax.add_collection(collection)
+    # Empty proxy lines, so the legend still lists every series
+    for color, linestyle, label in zip(colors, linestyles, labels):
+        ax.plot([], [], color=color, linestyle=linestyle, label=label)
+    ax.autoscale_view()
+
+
+def _pooled_axes(figsize, twin: bool):
+    # Plots that are only saved reuse one figure per size: clearing its axes is much
+    # cheaper than creating a new figure and axes for every plot
+    entry = _FIGURE_POOL.get(figsize)
+    if entry is None:
+        fig, ax1 = plt.subplots(figsize=figsize)
+        entry = _FIGURE_POOL[figsize] = (fig, ax1, ax1.twinx())
+    fig, ax1, ax2 = entry
+    ax1.clear()
+    ax2.clear()
+    # Restore the twin axis setup done by twinx, which clear() resets
+    ax2.yaxis.tick_right()
+    ax2.yaxis.set_label_position('right')
+    ax2.xaxis.set_visible(False)
+    ax2.patch.set_visible(False)
+    ax2.set_visible(twin)
+    ax1.yaxis.tick_left()
+    # Undo any subplots_adjust of the previous plot
+    fig.subplots_adjust(**{
+        key: plt.rcParams[f'figure.subplot.{key}']
+        for key in ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')
+    })
+    # Make the pooled figure and axes current, as a new figure would be for the plt.* calls
+    plt.figure(fig.number)
+    fig.sca(ax2 if twin else ax1)
+    return fig, ax1, ax2
+
 
 def plot_df(
     primary_dfs: List[pd.DataFrame],
@@ -23,34 +112,23 @@ def plot_df(
     band = common.band
 
     # Calculate the minimum timestamp for alignment
-    min_time = min(
-        [df['timestamp'].min() for df in primary_dfs + (secondary_dfs or [])]
-    )
+    all_dfs = [df for df in primary_dfs + (secondary_dfs or []) if not df.empty]
+    min_time = np.min([_timestamps(df).min() for df in all_dfs]) if all_dfs else 0
 
     # Plotting
-    fig, ax1 = plt.subplots(figsize=common.figsize)
+    twin = bool(secondary_axis and secondary_dfs)
+    if common.show:
+        fig, ax1 = plt.subplots(figsize=common.figsize)
+    else:
+        fig, ax1, pooled_ax2 = _pooled_axes(common.figsize, twin)
 
     # Plot primary y-axis data
-    for i, df in enumerate(primary_dfs):
-        df['time_since_start'] = (df['timestamp'] - min_time).dt.total_seconds()
-        plot_kwargs = primary_axis.plot_kwargs[i] if i < len(primary_axis.plot_kwargs) else {}
-        ax1.plot(
-            df['time_since_start'], df['value'], 
-            label=primary_axis.labels[i] if primary_axis.labels else None,
-            **plot_kwargs  # Apply unique styling options per time series
-        )
+    _plot_series(ax1, primary_dfs, primary_axis, min_time, common.max_points)
 
     # Configure secondary y-axis if provided
     if secondary_axis and secondary_dfs:
-        ax2 = ax1.twinx()
-        for i, df in enumerate(secondary_dfs):
-            df['time_since_start'] = (df['timestamp'] - min_time).dt.total_seconds()
-            plot_kwargs = secondary_axis.plot_kwargs[i] if i < len(secondary_axis.plot_kwargs) else {}
-            ax2.plot(
-                df['time_since_start'], df['value'],
-                label=secondary_axis.labels[i] if secondary_axis.labels else None,
-                **plot_kwargs  # Apply unique styling options per time series on the secondary axis
-            )
+        ax2 = ax1.twinx() if common.show else pooled_ax2
+        _plot_series(ax2, secondary_dfs, secondary_axis, min_time, common.max_points)
         ax2.set_ylabel(secondary_axis.ylabel)
         if secondary_axis.ylim:
             ax2.set_ylim(secondary_axis.ylim)
@@ -75,6 +153,11 @@ def plot_df(
         else:
             ax1.legend(lines_primary, labels_primary, **common.legend_kwargs)
 
+    # The plot style draws no spines
+    strip_spines(ax1)
+    if secondary_axis and secondary_dfs:
+        strip_spines(ax2)
+
     # Grid and layout options
     if common.minor_ticks:
         ax1.minorticks_on()
@@ -85,7 +168,7 @@ def plot_df(
     if grid_minor:
         ax1.grid(visible=True, which='minor', axis='both', **common.minor_grid_kwargs)
 
-    if secondary_axis and secondary_dfs:
+    if common.align_yaxes and secondary_axis and secondary_dfs:
         # Align the secondary y-axis with the primary y-axis
         ax2.set_yticks(np.linspace(ax2.get_yticks()[0], ax2.get_yticks()[-1], len(ax1.get_yticks())))
     
@@ -104,4 +187,55 @@ def plot_df(
         os.makedirs(output_dir, exist_ok=True)
         plt.savefig(common.output_path, format='pdf', bbox_inches='tight')
 
-    plt.show()
+    if common.show:
+        plt.show()
+        # Free the figure, so batches of plots do not accumulate open figures
+        plt.close(fig)
+
+
+def split_by(
+    df: pd.DataFrame,
+    col: str,
+    cols=("timestamp", "value"),
+    keys: Optional[List] = None,
+):
+    """
+    Split a long-form DataFrame into one DataFrame per value of a label column.
+    Uses a single groupby pass instead of one boolean mask per value.
+    :param df: The DataFrame to split.
+    :param col: The label column to split by (e.g. 'server_name').
+    :param cols: The columns kept in each part.
+    :param keys: The label values to return, in order. Values without data get an
+        empty DataFrame. Defaults to all the values of the column, sorted.
+    :return: The label values and the DataFrame of each value.
+    """
+    cols = list(cols)
+    # The parts keep the row labels of df: plot_df only uses the columns, so resetting
+    # the index would just copy every part once more
+    # Select the columns on the groupby, so each part is sliced with only those columns
+    # instead of slicing every column and projecting each part again
+    groups = dict(iter(df.groupby(col, sort=True, observed=True)[cols]))
+    if keys is None:
+        keys = list(groups)
+    return keys, [groups.get(key, pd.DataFrame(columns=cols)) for key in keys]
+
+
+def split_by_polars(lf, col: str, cols=("timestamp", "value")):
+    """
+    Split a polars LazyFrame into one pandas DataFrame per value of a label column.
+    The query runs in polars and only the parts are converted to pandas, at the
+    plotting boundary.
+    :param lf: The polars LazyFrame to split, e.g. from scan_metrics.
+    :param col: The label column to split by (e.g. 'server_name').
+    :param cols: The columns kept in each part.
+    :return: The sorted label values and the DataFrame of each value.
+    """
+    cols = list(cols)
+    df = lf.select([col, *cols]).drop_nulls(col).collect()
+    parts = {
+        # polars 1.x returns the keys of as_dict partitions as tuples
+        key[0] if isinstance(key, tuple) else key: part
+        for key, part in df.partition_by(col, as_dict=True).items()
+    }
+    keys = sorted(parts)
+    return keys, [parts[key].select(cols).to_pandas() for key in keys]
@@ -0,0 +1,85 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, Sequence, Tuple
+
+
+def _init_worker(setup_style: bool):
+    # Matplotlib is not thread-safe, but each worker process has its own state.
+    # Select the non-interactive backend before pyplot is imported.
+    import matplotlib
+    matplotlib.use("Agg")
+    # Nothing is shown from the workers, so plots are only saved, on a reused figure
+    os.environ["PLOT_SHOW"] = "0"
+    if setup_style:
+        from plotting.style_setup import setup_plot_style
+        setup_plot_style()
+
+
+def _run_job(template: Callable, args: Sequence):
+    template(*args)
+
+
+def render_plots(
+    jobs: List[Tuple[Callable, Sequence]],
+    max_workers: Optional[int] = None,
+    setup_style: bool = True,
+):
+    """
+    Render several plot templates concurrently, one process per worker.
+    Each template writes its own output_path, so they can run independently.
+    :param jobs: The (template, args) pairs to render, e.g. (mspt_plot, (experiment, selected_metrics, type_exp)).
+    :param max_workers: Number of worker processes. Defaults to half the CPU count.
+    :param setup_style: Whether to apply setup_plot_style in each worker.
+    """
+    if max_workers is None:
+        max_workers = max(1, (os.cpu_count() or 2) // 2)
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(setup_style,),
+    ) as executor:
+        futures = [executor.submit(_run_job, template, args) for template, args in jobs]
+        # Re-raise the first error of any template
+        for future in futures:
+            future.result()
+
+
+def run_all_plots(
+    experiment,
+    selected_metrics,
+    type_exp,
+    band: bool = False,
+    max_workers: Optional[int] = None,
+):
+    """
+    Render every plot template of an experiment concurrently.
+    :param experiment: The name of the experiment to plot.
+    :param selected_metrics: List of selected metrics.
+    :param type_exp: Type of experiment ('exp_vanilla' or 'exp_mod').
+    :param band: Whether quality_master_plot draws the quality band.
+    :param max_workers: Number of worker processes. Defaults to one per CPU, since every job here is
+        an independent CPU-bound template, unlike the half-CPU default of render_plots.
+    """
+    from plotting import plot_templates as t
+
+    args = (experiment, selected_metrics, type_exp)
+    jobs = [
+        (template, args)
+        for template in (
+            t.tps_players_plot,
+            t.mspt_plot,
+            t.mspt_stats_plot,
+            t.player_tps_server_plot,
+            t.players_servers_plot,
+            t.tps_servers_plot,
+            t.chunk_ownership_plot,
+            t.players_chunks_owner_plot,
+            t.players_master_plot,
+            t.mspt_master_plot,
+            t.mspt_tps_master_plot,
+            t.owned_chunks_master_plot,
+            t.max_diff_chunks_master_plot,
+        )
+    ]
+    jobs.append((t.quality_master_plot, args + (band,)))
+    render_plots(jobs, max_workers=max_workers or os.cpu_count())
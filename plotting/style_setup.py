@@ -1,54 +1,291 @@
-import matplotlib as mpl
-import matplotlib.pyplot as plt
-from cycler import cycler
+import os
+import shutil
+import sys
+import time
+from functools import lru_cache
+from types import MappingProxyType
 
+# matplotlib is only imported when the style is applied, so importing this module is cheap
 
-def setup_plot_style():
+# LaTeX preamble for the Libertine font of the papers; not loaded by default, since each
+# LaTeX run then reads the whole font set
+LIBERTINE_PREAMBLE = "\n".join(
+    [
+        r"\usepackage{libertine}",
+        # r"\usepackage{lmodern}",
+    ]
+)
+
+# Colors of the property cycle, for code that needs the palette outside of the style
+COLORS = ("#348ABD", "#7A68A6", "#A60628", "#467821", "#CF4457", "#188487", "#E24A33")
+
+# matplotlib's default grid.color, which the axes edges are drawn with
+_GRID_COLOR = "#b0b0b0"
+
+# The style settings, built once at import as read-only mappings shared by every call;
+# the cycler, which needs matplotlib, is added by setup_plot_style
+_RC = MappingProxyType({
+    "font.family": "serif",
+    "font.size": 12,  # footnote/caption size 9pt for paper
+    # "font.size": 10,     # caption size 10pt on thesis
+    # "lines.linewidth": 0.8,
+    "lines.markersize": 3,
+    "axes.linewidth": 0.5,
+    "grid.linewidth": 0.3,
+    "grid.linestyle": "-",
+    "axes.edgecolor": _GRID_COLOR,
+    # "ytick.color": _GRID_COLOR,
+    "ytick.direction": "in",
+    # "xtick.color": _GRID_COLOR,
+    "xtick.direction": "in",
+    "axes.titlesize": "medium",
+    "axes.titlepad": 4,
+    "axes.labelpad": 1,
+    "axes.axisbelow": True,  # grid below patches
+    "legend.labelspacing": 0.1,
+    "legend.handlelength": 1,
+    "legend.handletextpad": 0.2,
+    "legend.columnspacing": 1,
+    "legend.borderpad": 0.1,
+    # Smaller and faster to write PDFs: compress the streams and drop path vertices
+    # that do not change the rendered line
+    "pdf.compression": 9,
+    "path.simplify": True,
+    "path.simplify_threshold": 1.0,
+})
+
+# Text rendered by LaTeX, for paper figures: much slower, every new label runs pdflatex
+_TEX_RC = MappingProxyType({
+    "text.usetex": True,
+})
+
+# TeX engines for the pgf backend, fastest first: lualatex and xelatex compile straight
+# to PDF and load OpenType fonts natively
+TEX_SYSTEMS = ("lualatex", "xelatex", "pdflatex")
+
+# Text rendered by matplotlib's mathtext, with Computer Modern math, without LaTeX
+_MATHTEXT_RC = MappingProxyType({
+    "text.usetex": False,
+    "mathtext.fontset": "cm",
+})
+
+# Draft mode, for fast iteration: no LaTeX and low resolution raster output
+_DRAFT_RC = MappingProxyType({
+    "savefig.dpi": 100,
+})
+
+# Font files registered with matplotlib when the style is applied, e.g. LibertinusSerif-Regular.otf;
+# their families are tried first for serif text
+FONTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts")
+
+# Persistent matplotlib config and cache directory, so LaTeX renders are reused across runs
+MPL_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".mpl_cache")
+# Cached LaTeX renders not used for this many days are removed
+TEX_CACHE_MAX_AGE_DAYS = 30
+
+# The (usetex, preamble, draft) of the style applied in this process, None if it was not applied yet
+_STYLE_APPLIED = None
+
+
+def setup_plot_style(usetex=None, preamble="", draft=None):
     """
     Set up the matplotlib style for plots.
     This function configures the global matplotlib settings to ensure consistent styling across plots.
+    The style is only applied once per process; later calls with the same arguments return immediately.
+    :param usetex: Render text with LaTeX, as for paper figures. Defaults to the PLOT_USETEX
+        environment variable ('1' to enable), off otherwise; batch and CI runs should leave it off.
+    :param preamble: LaTeX preamble of the pgf backend, e.g. LIBERTINE_PREAMBLE for the paper
+        font. Empty by default, which keeps each LaTeX run short.
+    :param draft: Draft mode for fast iteration: no LaTeX whatever usetex says, the Agg backend
+        and a lower savefig resolution. Defaults to the PLOT_DRAFT environment variable ('1'
+        to enable); render the final figures again without it.
     """
+    global _STYLE_APPLIED
+    if draft is None:
+        draft = os.environ.get("PLOT_DRAFT", "0") == "1"
+    if usetex is None:
+        usetex = os.environ.get("PLOT_USETEX", "0") == "1"
+    usetex = usetex and not draft
+    if _STYLE_APPLIED == (usetex, preamble, draft):
+        return
+    if usetex and "matplotlib" not in sys.modules:
+        # matplotlib reads MPLCONFIGDIR on import; an unwritable config directory makes it
+        # fall back to a temporary cache, which renders every label with LaTeX again
+        os.environ.setdefault("MPLCONFIGDIR", MPL_CACHE_DIR)
+        os.makedirs(os.environ["MPLCONFIGDIR"], mode=0o755, exist_ok=True)
+    import matplotlib
+    if draft:
+        # Select the backend before pyplot is imported
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
 
     # mpl.use("pdf")
     # plt.close("all")
-    plt.rcParams.update(
-        {
-            "text.usetex": True,
-            "font.family": "serif",
-            "pgf.texsystem": "pdflatex",
-            "font.size": 12,  # footnote/caption size 9pt for paper
-            # "font.size": 10,     # caption size 10pt on thesis
-            "pgf.preamble": "\n".join(
-                [
-                    r"\usepackage{libertine}",
-                    # r"\usepackage{lmodern}",
-                ]
-            ),
-            # "lines.linewidth": 0.8,
-            "lines.markersize": 3,
-            "axes.linewidth": 0.5,
-            "grid.linewidth": 0.3,
-            "grid.linestyle": "-",
-            "axes.edgecolor": mpl.rcParams["grid.color"],
-            # "ytick.color": mpl.rcParams["grid.color"],
-            "ytick.direction": "in",
-            # "xtick.color": mpl.rcParams["grid.color"],
-            "xtick.direction": "in",
-            "axes.titlesize": "medium",
-            "axes.titlepad": 4,
-            "axes.labelpad": 1,
-            "axes.spines.top": False,
-            "axes.spines.right": False,
-            "axes.spines.bottom": False,
-            "axes.spines.left": False,
-            "axes.axisbelow": True,  # grid below patches
-            "axes.prop_cycle": cycler(
-                "color", ["#348ABD", "#7A68A6", "#A60628", "#467821", "#CF4457", "#188487", "#E24A33"]
-            ),
-            "legend.labelspacing": 0.1,
-            "legend.handlelength": 1,
-            "legend.handletextpad": 0.2,
-            "legend.columnspacing": 1,
-            "legend.borderpad": 0.1,
-        }
-    )
+    plt.rcParams.update({**_style_rc(usetex, preamble), **(_DRAFT_RC if draft else {})})
+    _STYLE_APPLIED = (usetex, preamble, draft)
+    if usetex:
+        _prune_tex_cache(os.path.join(matplotlib.get_cachedir(), "tex.cache"))
+
+
+def style_context(usetex=None, preamble=""):
+    """
+    Apply the plot style only within a with block, restoring the previous settings on exit.
+    Lets a single figure use the style without changing the global matplotlib settings.
+    :param usetex: Render text with LaTeX, as in setup_plot_style.
+    :param preamble: LaTeX preamble of the pgf backend, as in setup_plot_style.
+    :return: The context manager, e.g. with style_context(): plot_df(...)
+    """
+    import matplotlib
+
+    if usetex is None:
+        usetex = os.environ.get("PLOT_USETEX", "0") == "1"
+    return matplotlib.rc_context(_style_rc(usetex, preamble))
+
+
+def strip_spines(*axes):
+    """
+    Hide all the spines of some axes; the plot style draws none.
+    Hiding them on the axes rather than through rcParams keeps four settings out of the style.
+    :param axes: The axes to strip.
+    """
+    for ax in axes:
+        for spine in ax.spines.values():
+            spine.set_visible(False)
+
+
+def save_paper(fig, path):
+    r"""
+    Save a figure for a LaTeX paper as a PDF with the graphics and a PGF file with the text.
+    LaTeX then only typesets the text of the figure, instead of parsing every plotted point
+    as PGF commands; include the figure with \input{<path>.pgf}, which needs graphicx.
+    :param fig: The figure to save.
+    :param path: The output path, without extension or with any; <path>.pdf and <path>.pgf are written.
+        The PGF file includes <path>.pdf by this same path, which LaTeX resolves relative to the
+        main document, so pass the path as the document will \input it.
+    :return: The path of the PGF file.
+    """
+    from matplotlib.text import Text
+
+    base = os.path.splitext(path)[0]
+    output_dir = os.path.dirname(base)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    # Draw once, so the text positions are final
+    fig.canvas.draw()
+    renderer = fig.canvas.get_renderer()
+    texts = [text for text in fig.findobj(match=Text) if text.get_visible() and text.get_text()]
+    width, height = fig.get_size_inches()
+    # LaTeX paths always use forward slashes
+    base_tex = base.replace(os.sep, "/")
+    lines = [
+        r"\begin{pgfpicture}",
+        rf"\pgfpathrectangle{{\pgfpointorigin}}{{\pgfqpoint{{{width:.4f}in}}{{{height:.4f}in}}}}",
+        r"\pgfusepath{use as bounding box}",
+        rf"\pgftext[left,bottom]{{\includegraphics[width={width:.4f}in]{{{base_tex}.pdf}}}}",
+    ]
+    for text in texts:
+        # Centering on the extent of the rendered text also places rotated labels correctly
+        x, y = text.get_window_extent(renderer).get_points().mean(axis=0) / fig.dpi
+        size = text.get_fontsize()
+        lines.append(
+            rf"\pgftext[at=\pgfqpoint{{{x:.4f}in}}{{{y:.4f}in}},rotate={text.get_rotation():.1f}]"
+            rf"{{\fontsize{{{size:.1f}}}{{{1.2 * size:.1f}}}\selectfont {_tex_escape(text.get_text())}}}"
+        )
+    lines.append(r"\end{pgfpicture}")
+
+    # The PDF only holds the graphics: hide the text while saving it, without a tight
+    # bounding box, so the PGF coordinates match the page
+    for text in texts:
+        text.set_visible(False)
+    try:
+        fig.savefig(f"{base}.pdf", format="pdf")
+    finally:
+        for text in texts:
+            text.set_visible(True)
+    with open(f"{base}.pgf", "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return f"{base}.pgf"
+
+
+# LaTeX escapes of the special characters of plain text
+_TEX_SPECIAL = {
+    "\\": r"\textbackslash{}",
+    "%": r"\%",
+    "&": r"\&",
+    "#": r"\#",
+    "_": r"\_",
+    "{": r"\{",
+    "}": r"\}",
+}
+
+
+def _tex_escape(text):
+    # Escape the LaTeX special characters outside of $...$ math
+    parts = text.split("$")
+    for i in range(0, len(parts), 2):
+        parts[i] = "".join(_TEX_SPECIAL.get(char, char) for char in parts[i])
+    return "$".join(parts)
+
+
+def _style_rc(usetex, preamble):
+    # The full settings of the style; the pgf.* settings are only read by LaTeX runs and the
+    # pgf backend, so they are left out otherwise
+    import matplotlib
+
+    # Read the backend without resolving it, which rcParams["backend"] would do
+    pgf = usetex or str(dict.get(matplotlib.rcParams, "backend", "")).lower() == "pgf"
+    return {
+        **_RC,
+        **(_TEX_RC if usetex else _MATHTEXT_RC),
+        **({"pgf.texsystem": _tex_system(), "pgf.preamble": preamble} if pgf else {}),
+        # Name the serif fonts explicitly, so font lookups resolve on the first family
+        "font.serif": list(_serif_fonts()),
+        "axes.prop_cycle": _color_cycler(),
+    }
+
+
+@lru_cache(maxsize=None)
+def _color_cycler():
+    # Built once, on first use, since cycler is only imported with matplotlib
+    from cycler import cycler
+
+    return cycler("color", COLORS)
+
+
+@lru_cache(maxsize=None)
+def _serif_fonts():
+    # Register the font files of FONTS_DIR once per process, ahead of matplotlib's bundled
+    # DejaVu Serif, which is always available
+    from matplotlib import font_manager
+
+    families = []
+    if os.path.isdir(FONTS_DIR):
+        for name in sorted(os.listdir(FONTS_DIR)):
+            if name.lower().endswith((".otf", ".ttf")):
+                path = os.path.join(FONTS_DIR, name)
+                font_manager.fontManager.addfont(path)
+                family = font_manager.FontProperties(fname=path).get_name()
+                if family not in families:
+                    families.append(family)
+    return (*families, "DejaVu Serif")
+
+
+@lru_cache(maxsize=None)
+def _tex_system():
+    # The first installed engine, probed once per process
+    return next((tex for tex in TEX_SYSTEMS if shutil.which(tex)), "pdflatex")
+
+
+def _prune_tex_cache(tex_cache_dir):
+    # Drop LaTeX renders not used recently, so the cache directory stays small to scan;
+    # newer matplotlib versions spread the cache over nested directories
+    cutoff = time.time() - TEX_CACHE_MAX_AGE_DAYS * 24 * 3600
+    for root, _, files in os.walk(tex_cache_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                if os.stat(path).st_atime < cutoff:
+                    os.remove(path)
+            except OSError:
+                # Another process may be using or removing the file
+                pass